@@ -26,7 +26,7 @@ Features:
     'website': 'https://www.yourcompany.com',
     'depends': ['base', 'web', 'mail', 'global_translation', 'spc'],
     'external_dependencies': {
-        'python': ['barcode', 'Pillow'],
+        'python': ['barcode', 'Pillow', 'numpy'],
     },
     'data': [
         'security/ir.model.access.csv',
@@ -1,12 +1,12 @@
 # -*- coding: utf-8 -*-
 
-from odoo import models, fields, api
+from odoo import models, fields, api, tools
 import logging
 import json
-import pytz
+from odoo.exceptions import UserError
+from .timezones import IST_TZ, UTC_TZ
 
 _logger = logging.getLogger(__name__)
-from odoo.exceptions import UserError
 
 
 class AumannMeasurement(models.Model):
@@ -18,16 +18,8 @@ class AumannMeasurement(models.Model):
     @api.model
     def get_ist_now(self):
         """Get current IST datetime for consistent timezone handling"""
-        try:
-            ist = pytz.timezone('Asia/Kolkata')
-            utc_now = fields.Datetime.now()
-            # Convert UTC to IST
-            ist_now = pytz.UTC.localize(utc_now).astimezone(ist)
-            # Return as naive datetime in IST (Odoo will handle display)
-            return ist_now.replace(tzinfo=None)
-        except Exception as e:
-            _logger.warning(f"Error getting IST time: {e}, falling back to UTC")
-            return fields.Datetime.now()
+        # Convert UTC to IST and return it naive (Odoo will handle display)
+        return UTC_TZ.localize(fields.Datetime.now()).astimezone(IST_TZ).replace(tzinfo=None)
 
     serial_number = fields.Char('Serial Number', required=True, index=True)
     machine_id = fields.Many2one('manufacturing.machine.config', 'Machine', required=True)
@@ -308,11 +300,16 @@ class AumannMeasurement(models.Model):
     ], string='Result', required=True)
 
     rejection_reason = fields.Text('Rejection Reason')
-    raw_data = fields.Text('Raw Data')
+    raw_data = fields.Text('Raw Data', prefetch=False)  # Loaded only when read, not with every record
 
     # Rendered tolerance table (read-only)
     tolerance_table_html = fields.Html(string='Tolerance Summary', compute='_compute_tolerance_table', sanitize=False)
 
+    def init(self):
+        """Composite index backing the per-machine dashboard aggregates on test_date/result"""
+        tools.create_index(self.env.cr, 'manufacturing_aumann_measurement_machine_date_result_idx',
+                           self._table, ['machine_id', 'test_date', 'result'])
+
     @api.depends('part_form')
     def _compute_camshaft_type(self):
         """Determine camshaft type based on part_form"""
@@ -452,21 +449,31 @@ class AumannMeasurement(models.Model):
             return {}
         raw = self.env['ir.config_parameter'].sudo().get_param(param_key) or ''
         try:
-            data = json.loads(raw) if raw else {}
-            # Normalize keys to strings and values to (lower, upper)
-            normalized = {}
-            for k, v in (data or {}).items():
-                if isinstance(v, (list, tuple)) and len(v) == 2:
-                    try:
-                        field_name = self._normalize_tolerance_key(k)
-                        normalized[str(field_name)] = (float(v[0]), float(v[1]))
-                    except Exception:
-                        continue
-            return normalized
+            return self._parse_tolerances(raw)
         except Exception as e:
             _logger.warning(f"Invalid tolerance JSON for prefix {prefix}: {e}")
             return {}
 
+    @api.model
+    @tools.ormcache('raw')
+    def _parse_tolerances(self, raw):
+        """Parse and normalize a tolerance JSON value, cached by its raw text
+        
+        Keyed on the text itself, so a changed parameter simply parses into a new entry.
+        The returned dict is shared between callers and must not be modified.
+        """
+        data = json.loads(raw) if raw else {}
+        # Normalize keys to strings and values to (lower, upper)
+        normalized = {}
+        for k, v in (data or {}).items():
+            if isinstance(v, (list, tuple)) and len(v) == 2:
+                try:
+                    field_name = self._normalize_tolerance_key(k)
+                    normalized[str(field_name)] = (float(v[0]), float(v[1]))
+                except Exception:
+                    continue
+        return normalized
+
     def _evaluate_against_tolerances(self, tolerance_map):
         """Check all present fields against provided tolerances.
         Returns tuple: (result_str, reason_str, total, passed, failed)
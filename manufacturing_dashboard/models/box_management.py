@@ -6,7 +6,8 @@ import barcode
 from barcode.writer import ImageWriter
 import io
 import base64
-import pytz
+from collections import Counter
+from .timezones import IST_TZ, UTC_TZ
 
 _logger = logging.getLogger(__name__)
 
@@ -20,16 +21,8 @@ class BoxManagement(models.Model):
     @api.model
     def get_ist_now(self):
         """Get current IST datetime for consistent timezone handling"""
-        try:
-            ist = pytz.timezone('Asia/Kolkata')
-            utc_now = fields.Datetime.now()
-            # Convert UTC to IST
-            ist_now = pytz.UTC.localize(utc_now).astimezone(ist)
-            # Return as naive datetime in IST (Odoo will handle display)
-            return ist_now.replace(tzinfo=None)
-        except Exception as e:
-            _logger.warning(f"Error getting IST time: {e}, falling back to UTC")
-            return fields.Datetime.now()
+        # Convert UTC to IST and return it naive (Odoo will handle display)
+        return UTC_TZ.localize(fields.Datetime.now()).astimezone(IST_TZ).replace(tzinfo=None)
 
     box_number = fields.Char('Box Number', required=True, index=True)
     part_variant = fields.Selection([
@@ -71,9 +64,11 @@ class BoxManagement(models.Model):
     @api.depends('part_quality_ids', 'part_quality_ids.final_result')
     def _compute_statistics(self):
         for record in self:
+            # One pass over the box's parts instead of a filtered() pass per result
+            results = Counter(record.part_quality_ids.mapped('final_result'))
             record.total_parts = len(record.part_quality_ids)
-            record.passed_parts = len(record.part_quality_ids.filtered(lambda p: p.final_result == 'pass'))
-            record.rejected_parts = len(record.part_quality_ids.filtered(lambda p: p.final_result == 'reject'))
+            record.passed_parts = results['pass']
+            record.rejected_parts = results['reject']
     
     @api.model
     def get_or_create_current_box(self, part_variant):
@@ -146,6 +141,54 @@ class BoxManagement(models.Model):
         
         return self.current_position
     
+    def add_parts_to_box(self, part_quality_ids):
+        """Add as many parts as still fit into the current box
+        
+        :param part_quality_ids: Ids of the parts to add, in filling order
+        :return: Ids of the parts that were added
+        """
+        self.ensure_one()
+        
+        if self.status != 'open':
+            raise ValueError(f"Cannot add parts to box {self.box_number} - status is {self.status}")
+        
+        free = self.max_capacity - self.current_position
+        if free <= 0:
+            raise ValueError(f"Box {self.box_number} is already full")
+        
+        added_ids = list(part_quality_ids)[:free]
+        parts = self.env['manufacturing.part.quality'].browse(added_ids)
+        first_position = self.current_position + 1
+        
+        # Box fields are shared by every part and go through the ORM so the box statistics recompute;
+        # the per-part positions are set with one UPDATE from a list of (id, position) pairs
+        parts.write({
+            'box_number': self.box_number,
+            'box_id': self.id
+        })
+        if added_ids:
+            params = []
+            for position, part_id in enumerate(added_ids, start=first_position):
+                params += [part_id, position]
+            parts.flush_recordset(['box_position'])
+            self.env.cr.execute("""
+                UPDATE %s part
+                SET box_position = positions.position
+                FROM (VALUES %s) AS positions(id, position)
+                WHERE part.id = positions.id
+            """ % (parts._table, ', '.join(['(%s, %s)'] * len(added_ids))), params)
+            parts.invalidate_recordset(['box_position'])
+        self.current_position += len(added_ids)
+        
+        _logger.info("Added %s parts to box %s at positions %s-%s",
+                     len(added_ids), self.box_number, first_position, self.current_position)
+        
+        # Check if box is now full
+        if self.current_position >= self.max_capacity:
+            self._complete_box()
+        
+        return added_ids
+    
     def _complete_box(self):
         """Mark box as full and generate barcode"""
         self.ensure_one()
@@ -3,7 +3,7 @@
 from odoo import models, fields, api
 import logging
 from datetime import datetime
-import pytz
+from .timezones import IST_TZ, UTC_TZ
 
 _logger = logging.getLogger(__name__)
 
@@ -17,16 +17,8 @@ class FinalStationMeasurement(models.Model):
     @api.model
     def get_ist_now(self):
         """Get current IST datetime for consistent timezone handling"""
-        try:
-            ist = pytz.timezone('Asia/Kolkata')
-            utc_now = fields.Datetime.now()
-            # Convert UTC to IST
-            ist_now = pytz.UTC.localize(utc_now).astimezone(ist)
-            # Return as naive datetime in IST (Odoo will handle display)
-            return ist_now.replace(tzinfo=None)
-        except Exception as e:
-            _logger.warning(f"Error getting IST time: {e}, falling back to UTC")
-            return fields.Datetime.now()
+        # Convert UTC to IST and return it naive (Odoo will handle display)
+        return UTC_TZ.localize(fields.Datetime.now()).astimezone(IST_TZ).replace(tzinfo=None)
 
     # Basic Information
     machine_id = fields.Many2one('manufacturing.machine.config', string='Final Station', required=True)
@@ -50,7 +42,7 @@ class FinalStationMeasurement(models.Model):
     ], string='Trigger Type', required=True)
     
     # Additional Data
-    raw_data = fields.Text('Raw Data', help='Raw data from camera/PLC')
+    raw_data = fields.Text('Raw Data', help='Raw data from camera/PLC', prefetch=False)
     notes = fields.Text('Notes', help='Additional notes or comments')
     
     # Box assignment at final station pass
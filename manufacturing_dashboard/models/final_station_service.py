@@ -5,12 +5,25 @@ import struct
 import time
 import logging
 from datetime import datetime
-import pytz
 from odoo import models, fields, api, _
 from odoo.exceptions import UserError
+from .timezones import IST_TZ, UTC_TZ
 
 _logger = logging.getLogger(__name__)
 
+# Station results that let a part through on their own
+_ACCEPT_RESULTS = frozenset(('pass', 'bypass'))
+
+
+def _final_station_status(results):
+    """Overall status of a part at the final station from its four station results"""
+    results = set(results)
+    if 'pending' in results or 'reject' in results:
+        return 'reject'  # Reject if ANY station is pending or failed
+    if _ACCEPT_RESULTS.issuperset(results) or 'bypass' in results:
+        return 'pass'    # Pass if all stations are pass or bypassed, or any is bypassed without failures
+    return 'reject'      # Default to reject
+
 
 class FinalStationService:
     """
@@ -21,16 +34,8 @@ class FinalStationService:
     @staticmethod
     def get_ist_now():
         """Get current IST datetime for consistent timezone handling"""
-        try:
-            ist = pytz.timezone('Asia/Kolkata')
-            utc_now = datetime.utcnow()
-            # Convert UTC to IST
-            ist_now = pytz.UTC.localize(utc_now).astimezone(ist)
-            # Return as naive datetime in IST
-            return ist_now.replace(tzinfo=None)
-        except Exception as e:
-            _logger.warning(f"Error getting IST time: {e}, falling back to UTC")
-            return datetime.now()
+        # Convert UTC to IST and return it naive
+        return UTC_TZ.localize(datetime.utcnow()).astimezone(IST_TZ).replace(tzinfo=None)
     
     def __init__(self, machine_record):
         self.machine = machine_record
@@ -1027,21 +1032,7 @@ class FinalStationService:
                 results = [part_quality.vici_result, part_quality.ruhlamat_result, 
                           part_quality.aumann_result, part_quality.gauging_result]
                 
-                any_pending = any(result == 'pending' for result in results)
-                any_reject = any(result == 'reject' for result in results)
-                all_pass_or_bypass = all(result in ('pass', 'bypass') for result in results)
-                any_bypass = any(result == 'bypass' for result in results)
-                
-                if any_pending:
-                    overall_status = 'reject'  # Reject if ANY station is pending
-                elif any_reject:
-                    overall_status = 'reject'  # Reject if any station failed
-                elif all_pass_or_bypass:
-                    overall_status = 'pass'    # Pass if all stations are pass or bypassed
-                elif any_bypass and not any_reject:
-                    overall_status = 'pass'    # Pass if any station is bypassed and no failures
-                else:
-                    overall_status = 'reject'  # Default to reject
+                overall_status = _final_station_status(results)
                 
                 # Update the part_quality record with the calculated overall status (only if override is not active)
                 if part_quality.final_result != overall_status:
@@ -1193,21 +1184,7 @@ class FinalStationService:
                       part_quality.aumann_result, part_quality.gauging_result]
             
             # Apply the same logic as in check_all_stations_result and get_station_results_for_dashboard
-            any_pending = any(result == 'pending' for result in results)
-            any_reject = any(result == 'reject' for result in results)
-            all_pass_or_bypass = all(result in ('pass', 'bypass') for result in results)
-            any_bypass = any(result == 'bypass' for result in results)
-            
-            if any_pending:
-                new_final_result = 'reject'  # Reject if ANY station is pending
-            elif any_reject:
-                new_final_result = 'reject'  # Reject if any station failed
-            elif all_pass_or_bypass:
-                new_final_result = 'pass'    # Pass if all stations are pass or bypassed
-            elif any_bypass and not any_reject:
-                new_final_result = 'pass'    # Pass if any station is bypassed and no failures
-            else:
-                new_final_result = 'reject'  # Default to reject
+            new_final_result = _final_station_status(results)
             
             # Update final_result if it has changed
             if part_quality.final_result != new_final_result:
@@ -1,9 +1,9 @@
 # -*- coding: utf-8 -*-
 
-from odoo import models, fields, api
+from odoo import models, fields, api, tools
 import logging
 import re
-import pytz
+from .timezones import IST_TZ, UTC_TZ
 
 _logger = logging.getLogger(__name__)
 
@@ -17,16 +17,8 @@ class GaugingMeasurement(models.Model):
     @api.model
     def get_ist_now(self):
         """Get current IST datetime for consistent timezone handling"""
-        try:
-            ist = pytz.timezone('Asia/Kolkata')
-            utc_now = fields.Datetime.now()
-            # Convert UTC to IST
-            ist_now = pytz.UTC.localize(utc_now).astimezone(ist)
-            # Return as naive datetime in IST (Odoo will handle display)
-            return ist_now.replace(tzinfo=None)
-        except Exception as e:
-            _logger.warning(f"Error getting IST time: {e}, falling back to UTC")
-            return fields.Datetime.now()
+        # Convert UTC to IST and return it naive (Odoo will handle display)
+        return UTC_TZ.localize(fields.Datetime.now()).astimezone(IST_TZ).replace(tzinfo=None)
 
     # Basic identification fields
     serial_number = fields.Char('Serial Number', required=True, index=True)
@@ -67,9 +59,14 @@ class GaugingMeasurement(models.Model):
     deviation = fields.Float('Deviation from Nominal', compute='_compute_deviation', store=True)
     
     # Raw data
-    raw_data = fields.Text('Raw Data')
+    raw_data = fields.Text('Raw Data', prefetch=False)  # Loaded only when read, not with every record
     rejection_reason = fields.Text('Rejection Reason')
     
+    def init(self):
+        """Composite index backing the per-machine dashboard aggregates on test_date/result"""
+        tools.create_index(self.env.cr, 'manufacturing_gauging_measurement_machine_date_result_idx',
+                           self._table, ['machine_id', 'test_date', 'result'])
+
     @api.depends('status')
     def _compute_result(self):
         for record in self:
@@ -6,13 +6,60 @@ import os
 import csv
 import json
 import logging
+import numpy as np
 import pyodbc  # or pypyodbc
 from datetime import datetime, timedelta
-import pytz
 from .plc_monitor_service import get_plc_monitor_service
+from .timezones import IST_TZ, UTC_TZ
 
 _logger = logging.getLogger(__name__)
 
+# Measurement model holding the test records of each machine type
+MACHINE_MODEL = {
+    'vici_vision': 'manufacturing.vici.vision',
+    'ruhlamat': 'manufacturing.ruhlamat.press',
+    'aumann': 'manufacturing.aumann.measurement',
+    'gauging': 'manufacturing.gauging.measurement',
+}
+
+# Serial number prefixes of the camshaft variants (480 = exhaust, 980 = intake)
+SERIAL_PREFIXES = frozenset({'480', '980'})
+
+# Key measurements averaged for the measurement chart, as (field, label) per machine type
+TREND_FIELDS = {
+    'vici_vision': (
+        ('l_64_8', 'L 64.8'), ('l_35_4', 'L 35.4'), ('l_46_6', 'L 46.6'),
+        ('l_82', 'L 82'), ('l_128_6', 'L 128.6'), ('l_164', 'L 164'),
+    ),
+    'aumann': (
+        ('diameter_journal_a1', 'Diameter A1'), ('diameter_journal_a2', 'Diameter A2'),
+        ('diameter_journal_b1', 'Diameter B1'), ('diameter_journal_b2', 'Diameter B2'),
+    ),
+    'gauging': (
+        ('angle_degrees', 'Angle (Degrees)'), ('measurement_value', 'Measurement Value'),
+    ),
+}
+
+
+def _column_means(matrix):
+    """Per-column means of a 2-D float array in one vectorized pass; zeros when there are no rows"""
+    if not matrix.shape[0]:
+        return np.zeros(matrix.shape[1])
+    return matrix.mean(axis=0)
+
+
+class DashboardContext:
+    """Machine and window of one analytics request, resolved once and shared by the chart helpers"""
+    __slots__ = ('machine_id', 'machine_type', 'model', 'start_dt', 'end_dt', 'interval', 'interval_counts')
+
+    def __init__(self, machine_id, machine_type, model, start_dt, end_dt, interval):
+        self.machine_id = machine_id
+        self.machine_type = machine_type
+        self.model = model
+        self.start_dt = start_dt
+        self.end_dt = end_dt
+        self.interval = interval
+        self.interval_counts = None
 
 
 class MachineConfig(models.Model):
@@ -23,16 +70,8 @@ class MachineConfig(models.Model):
     @api.model
     def get_ist_now(self):
         """Get current IST datetime for consistent timezone handling"""
-        try:
-            ist = pytz.timezone('Asia/Kolkata')
-            utc_now = fields.Datetime.now()
-            # Convert UTC to IST
-            ist_now = pytz.UTC.localize(utc_now).astimezone(ist)
-            # Return as naive datetime in IST (Odoo will handle display)
-            return ist_now.replace(tzinfo=None)
-        except Exception as e:
-            _logger.warning(f"Error getting IST time: {e}, falling back to UTC")
-            return fields.Datetime.now()
+        # Convert UTC to IST and return it naive (Odoo will handle display)
+        return UTC_TZ.localize(fields.Datetime.now()).astimezone(IST_TZ).replace(tzinfo=None)
 
     machine_name = fields.Char('Machine Name', required=True)
     machine_type = fields.Selection([
@@ -2849,12 +2888,9 @@ class MachineConfig(models.Model):
                 return self._determine_aumann_result_fallback(create_vals)
             
             # Determine variant from serial prefix
-            if serial_number.startswith('480'):
-                variant = '480'
-            elif serial_number.startswith('980'):
-                variant = '980'
-            else:
-                _logger.warning(f"Unknown serial prefix: {serial_number[:3]}, using default tolerances")
+            variant = serial_number[:3]
+            if variant not in SERIAL_PREFIXES:
+                _logger.warning(f"Unknown serial prefix: {variant}, using default tolerances")
                 return self._determine_aumann_result_fallback(create_vals)
             
             # Load tolerances for this variant
@@ -2926,6 +2962,19 @@ class MachineConfig(models.Model):
                 return
 
             records_created = 0
+            records_to_create = []
+            pending_keys = set()
+            
+            # Resolve machine tolerances once instead of re-reading them for every row
+            tolerance_bounds = None
+            tolerance_vals = {}
+            if self.gauging_upper_tolerance is not None and self.gauging_lower_tolerance is not None:
+                tolerance_bounds = (self.gauging_lower_tolerance, self.gauging_upper_tolerance)
+                tolerance_vals = {
+                    'upper_tolerance': self.gauging_upper_tolerance,
+                    'lower_tolerance': self.gauging_lower_tolerance,
+                    'nominal_value': self.gauging_nominal_value or 0.0
+                }
             
             # Read CSV file
             try:
@@ -2952,7 +3001,7 @@ class MachineConfig(models.Model):
                                 continue
                             
                             # Only process serial numbers that start with 480 or 980
-                            if not (serial_number.startswith('480') or serial_number.startswith('980')):
+                            if serial_number[:3] not in SERIAL_PREFIXES:
                                 _logger.debug(f"Skipping serial number {serial_number} - does not start with 480 or 980")
                                 continue
                             
@@ -2970,9 +3019,15 @@ class MachineConfig(models.Model):
                             # Parse test date
                             test_date = self._parse_csv_datetime(date_time_str)
                             
+                            # Rows queued in this run are not in the DB yet, so dedupe them here
+                            if (serial_number, test_date) in pending_keys:
+                                continue
+                            pending_keys.add((serial_number, test_date))
+                            
                             # Parse angle measurement and determine status
                             angle_measurement = result_str
-                            status_mapped, angle_within_tolerance, rejection_reason = self._evaluate_gauging_result(result_str)
+                            status_mapped, angle_within_tolerance, rejection_reason = self._evaluate_gauging_result(
+                                result_str, tolerance_bounds=tolerance_bounds)
                             
                             # Prepare data for creation
                             create_vals = {
@@ -2991,17 +3046,10 @@ class MachineConfig(models.Model):
                                 create_vals['rejection_reason'] = rejection_reason
                             
                             # Add tolerance data from machine config
-                            if self.gauging_upper_tolerance is not None and self.gauging_lower_tolerance is not None:
-                                create_vals.update({
-                                    'upper_tolerance': self.gauging_upper_tolerance,
-                                    'lower_tolerance': self.gauging_lower_tolerance,
-                                    'nominal_value': self.gauging_nominal_value or 0.0
-                                })
+                            create_vals.update(tolerance_vals)
                             
-                            # Create the record
-                            new_record = self.env['manufacturing.gauging.measurement'].create(create_vals)
-                            records_created += 1
-                            _logger.debug(f"Successfully created Gauging record for Serial Number: {serial_number}")
+                            # Queue the record for batch creation
+                            records_to_create.append(create_vals)
                             
                         except Exception as e:
                             _logger.error(f"Failed to process Gauging row {row_index}: {e}")
@@ -3012,6 +3060,26 @@ class MachineConfig(models.Model):
                 self.status = 'error'
                 return
             
+            # Batch create records (one ORM create per batch instead of per row)
+            Gauging = self.env['manufacturing.gauging.measurement']
+            batch_size = 500
+            for i in range(0, len(records_to_create), batch_size):
+                batch = records_to_create[i:i + batch_size]
+                try:
+                    with self.env.cr.savepoint():
+                        Gauging.create(batch)
+                    records_created += len(batch)
+                except Exception as e:
+                    _logger.error(f"Failed to create Gauging batch {i//batch_size + 1}: {e}")
+                    # Try individual creates for this batch
+                    for vals in batch:
+                        try:
+                            with self.env.cr.savepoint():
+                                Gauging.create(vals)
+                            records_created += 1
+                        except Exception as e2:
+                            _logger.error(f"Failed to create Gauging record for SN {vals.get('serial_number', 'unknown')}: {e2}")
+            
             _logger.info(f"Gauging data sync completed. Total records created: {records_created}")
             
         except FileNotFoundError:
@@ -3063,8 +3131,10 @@ class MachineConfig(models.Model):
             _logger.warning(f"Could not parse date '{date_time_str}': {e}. Using current time.")
             return fields.Datetime.now()
     
-    def _evaluate_gauging_result(self, result_str):
-        """Evaluate gauging result and determine status, tolerance, and rejection reason"""
+    def _evaluate_gauging_result(self, result_str, tolerance_bounds=None):
+        """Evaluate gauging result and determine status, tolerance, and rejection reason.
+        tolerance_bounds: optional pre-resolved (lower, upper) tuple; read from the machine if omitted
+        """
         if not result_str:
             return 'accept', True, None
             
@@ -3073,12 +3143,15 @@ class MachineConfig(models.Model):
             decimal_degrees = self._parse_angle_to_decimal(result_str)
             
             # Check against machine tolerance settings
-            if (self.gauging_upper_tolerance is not None and 
-                self.gauging_lower_tolerance is not None):
-                
-                if not (self.gauging_lower_tolerance <= decimal_degrees <= self.gauging_upper_tolerance):
+            if tolerance_bounds is None and (self.gauging_upper_tolerance is not None and
+                                             self.gauging_lower_tolerance is not None):
+                tolerance_bounds = (self.gauging_lower_tolerance, self.gauging_upper_tolerance)
+            
+            if tolerance_bounds is not None:
+                lower_tol, upper_tol = tolerance_bounds
+                if not (lower_tol <= decimal_degrees <= upper_tol):
                     rejection_reason = (f"Angle {decimal_degrees:.4f}° out of tolerance "
-                                      f"({self.gauging_lower_tolerance:.4f}° - {self.gauging_upper_tolerance:.4f}°)")
+                                      f"({lower_tol:.4f}° - {upper_tol:.4f}°)")
                     return 'reject', False, rejection_reason
             
             # Default to accept if within tolerance or no tolerance set
@@ -3340,7 +3413,7 @@ class MachineConfig(models.Model):
 
         for machine in machines:
             # Get filtered window stats for this machine
-            machine_stats = self._get_machine_stats_for_period(machine.id, start_date, end_date)
+            machine_stats = self._get_machine_stats_for_period(machine, start_date, end_date)
 
             machine_info = {
                 'id': machine.id,
@@ -3379,64 +3452,16 @@ class MachineConfig(models.Model):
 
         return dashboard_data
 
-    def _get_machine_today_stats(self, machine_id):
-        """Get today's statistics for a specific machine"""
-        today = fields.Date.today()
-        machine = self.browse(machine_id)
-
-        stats = {
-            'total_count': 0,
-            'ok_count': 0,
-            'reject_count': 0,
-            'rejection_rate': 0.0
-        }
-
-        if machine.machine_type == 'vici_vision':
-            records = self.env['manufacturing.vici.vision'].search([
-                ('machine_id', '=', machine_id),
-                ('test_date', '>=', today)
-            ])
-            stats['total_count'] = len(records)
-            stats['ok_count'] = len(records.filtered(lambda r: r.result == 'pass'))
-            stats['reject_count'] = len(records.filtered(lambda r: r.result == 'reject'))
-
-        elif machine.machine_type == 'ruhlamat':
-            records = self.env['manufacturing.ruhlamat.press'].search([
-                ('machine_id', '=', machine_id),
-                ('test_date', '>=', today)
-            ])
-            stats['total_count'] = len(records)
-            stats['ok_count'] = len(records.filtered(lambda r: r.result == 'pass'))
-            stats['reject_count'] = len(records.filtered(lambda r: r.result == 'reject'))
-
-        elif machine.machine_type == 'aumann':
-            records = self.env['manufacturing.aumann.measurement'].search([
-                ('machine_id', '=', machine_id),
-                ('test_date', '>=', today)
-            ])
-            stats['total_count'] = len(records)
-            stats['ok_count'] = len(records.filtered(lambda r: r.result == 'pass'))
-            stats['reject_count'] = len(records.filtered(lambda r: r.result == 'reject'))
-
-        elif machine.machine_type == 'gauging':
-            records = self.env['manufacturing.gauging.measurement'].search([
-                ('machine_id', '=', machine_id),
-                ('test_date', '>=', today)
-            ])
-            stats['total_count'] = len(records)
-            stats['ok_count'] = len(records.filtered(lambda r: r.result == 'pass'))
-            stats['reject_count'] = len(records.filtered(lambda r: r.result == 'reject'))
-
-        # Calculate rejection rate
-        if stats['total_count'] > 0:
-            stats['rejection_rate'] = round((stats['reject_count'] / stats['total_count']) * 100, 2)
-
-        return stats
-
-    def _get_machine_stats_for_period(self, machine_id, start_date, end_date):
-        """Get statistics for a specific machine within a date range"""
-        machine = self.browse(machine_id)
+    def _get_machine_stats_for_period(self, machine, start_date, end_date):
+        """Get statistics for a specific machine within a date range (both days inclusive)"""
+        # Half-open [start, day after end) rather than '<=' a date, which the ORM widens to 23:59:59.999999
+        return self._get_machine_result_stats(machine, [
+            ('test_date', '>=', start_date),
+            ('test_date', '<', end_date + timedelta(days=1))
+        ])
 
+    def _get_machine_result_stats(self, machine, date_domain):
+        """Count a machine's test records per result with one grouped query, without loading them"""
         stats = {
             'total_count': 0,
             'ok_count': 0,
@@ -3444,45 +3469,18 @@ class MachineConfig(models.Model):
             'rejection_rate': 0.0
         }
 
-        if machine.machine_type == 'vici_vision':
-            records = self.env['manufacturing.vici.vision'].search([
-                ('machine_id', '=', machine_id),
-                ('test_date', '>=', start_date),
-                ('test_date', '<=', end_date)
-            ])
-            stats['total_count'] = len(records)
-            stats['ok_count'] = len(records.filtered(lambda r: r.result == 'pass'))
-            stats['reject_count'] = len(records.filtered(lambda r: r.result == 'reject'))
-
-        elif machine.machine_type == 'ruhlamat':
-            records = self.env['manufacturing.ruhlamat.press'].search([
-                ('machine_id', '=', machine_id),
-                ('test_date', '>=', start_date),
-                ('test_date', '<=', end_date)
-            ])
-            stats['total_count'] = len(records)
-            stats['ok_count'] = len(records.filtered(lambda r: r.result == 'pass'))
-            stats['reject_count'] = len(records.filtered(lambda r: r.result == 'reject'))
-
-        elif machine.machine_type == 'aumann':
-            records = self.env['manufacturing.aumann.measurement'].search([
-                ('machine_id', '=', machine_id),
-                ('test_date', '>=', start_date),
-                ('test_date', '<=', end_date)
-            ])
-            stats['total_count'] = len(records)
-            stats['ok_count'] = len(records.filtered(lambda r: r.result == 'pass'))
-            stats['reject_count'] = len(records.filtered(lambda r: r.result == 'reject'))
-
-        elif machine.machine_type == 'gauging':
-            records = self.env['manufacturing.gauging.measurement'].search([
-                ('machine_id', '=', machine_id),
-                ('test_date', '>=', start_date),
-                ('test_date', '<=', end_date)
-            ])
-            stats['total_count'] = len(records)
-            stats['ok_count'] = len(records.filtered(lambda r: r.result == 'pass'))
-            stats['reject_count'] = len(records.filtered(lambda r: r.result == 'reject'))
+        model = self._get_model_for_machine(machine)
+        if model is None:
+            return stats
+
+        groups = model._read_group([('machine_id', '=', machine.id)] + date_domain,
+                                   groupby=['result'], aggregates=['__count'])
+        for result, count in groups:
+            stats['total_count'] += count
+            if result == 'pass':
+                stats['ok_count'] += count
+            elif result == 'reject':
+                stats['reject_count'] += count
 
         # Calculate rejection rate
         if stats['total_count'] > 0:
@@ -3520,7 +3518,7 @@ class MachineConfig(models.Model):
                 end_date = today
 
             # Get basic stats for the filtered period
-            stats = self._get_machine_stats_for_period(machine_id, start_date, end_date)
+            stats = self._get_machine_stats_for_period(machine, start_date, end_date)
 
             # Initialize response data
             machine_data = {
@@ -3536,7 +3534,7 @@ class MachineConfig(models.Model):
                     'ok_count': stats['ok_count'],
                     'reject_count': stats['reject_count'],
                 },
-                'analytics': self._build_analytics(machine_id, start_date, end_date)
+                'analytics': self._build_analytics(machine, start_date, end_date)
             }
 
 
@@ -3546,53 +3544,8 @@ class MachineConfig(models.Model):
             _logger.error(f"Error in get_machine_detail_data: {str(e)}")
             return {'error': f'Failed to load machine detail data: {str(e)}'}
 
-    def _get_hourly_production(self, machine_id, date):
-        """Get hourly production data for charts"""
-        machine = self.browse(machine_id)
-        hourly_data = []
-
-        # Generate 24 hours of data
-        for hour in range(24):
-            start_time = datetime.combine(date, datetime.min.time()) + timedelta(hours=hour)
-            end_time = start_time + timedelta(hours=1)
-
-            if machine.machine_type == 'vici_vision':
-                count = self.env['manufacturing.vici.vision'].search_count([
-                    ('machine_id', '=', machine_id),
-                    ('test_date', '>=', start_time),
-                    ('test_date', '<', end_time)
-                ])
-            elif machine.machine_type == 'ruhlamat':
-                count = self.env['manufacturing.ruhlamat.press'].search_count([
-                    ('machine_id', '=', machine_id),
-                    ('test_date', '>=', start_time),
-                    ('test_date', '<', end_time)
-                ])
-            elif machine.machine_type == 'aumann':
-                count = self.env['manufacturing.aumann.measurement'].search_count([
-                    ('machine_id', '=', machine_id),
-                    ('test_date', '>=', start_time),
-                    ('test_date', '<', end_time)
-                ])
-            elif machine.machine_type == 'gauging':
-                count = self.env['manufacturing.gauging.measurement'].search_count([
-                    ('machine_id', '=', machine_id),
-                    ('test_date', '>=', start_time),
-                    ('test_date', '<', end_time)
-                ])
-            else:
-                count = 0
-
-            hourly_data.append({
-                'hour': f"{hour:02d}:00",
-                'count': count
-            })
-
-        return hourly_data
-
-    def _build_analytics(self, machine_id, start_date, end_date):
+    def _build_analytics(self, machine, start_date, end_date):
         """Build analytics payload based on the selected date range"""
-        machine = self.browse(machine_id)
 
         # Normalize to datetimes (inclusive start, exclusive end)
         start_dt = datetime.combine(start_date, datetime.min.time())
@@ -3607,9 +3560,11 @@ class MachineConfig(models.Model):
         else:
             interval = 'month'
 
-        production_series = self._get_production_series(machine, start_dt, end_dt, interval)
-        rejection_series = self._get_rejection_rate_series(machine, start_dt, end_dt, interval)
-        measurement_avg = self._get_measurement_average(machine, start_dt, end_dt)
+        ctx = DashboardContext(machine.id, machine.machine_type, self._get_model_for_machine(machine),
+                               start_dt, end_dt, interval)
+        production_series = self._get_production_series(ctx)
+        rejection_series = self._get_rejection_rate_series(ctx)
+        measurement_avg = self._get_measurement_average(ctx)
 
         return {
             'production_series': production_series,  # {labels:[], values:[]}
@@ -3618,15 +3573,8 @@ class MachineConfig(models.Model):
         }
 
     def _get_model_for_machine(self, machine):
-        if machine.machine_type == 'vici_vision':
-            return self.env['manufacturing.vici.vision']
-        if machine.machine_type == 'ruhlamat':
-            return self.env['manufacturing.ruhlamat.press']
-        if machine.machine_type == 'aumann':
-            return self.env['manufacturing.aumann.measurement']
-        if machine.machine_type == 'gauging':
-            return self.env['manufacturing.gauging.measurement']
-        return None
+        model_name = MACHINE_MODEL.get(machine.machine_type)
+        return self.env[model_name] if model_name else None
 
     def _iter_intervals(self, start_dt, end_dt, interval):
         current = start_dt
@@ -3652,186 +3600,84 @@ class MachineConfig(models.Model):
             yield (current, min(nxt, end_dt), label)
             current = nxt
 
-    def _get_production_series(self, machine, start_dt, end_dt, interval):
-        model = self._get_model_for_machine(machine)
+    def _get_interval_counts(self, ctx):
+        """Total and rejected test counts per interval label, from a single grouped query
+        shared by the production and rejection series of the same request"""
+        if ctx.interval_counts is not None:
+            return ctx.interval_counts
+
+        ctx.model.flush_model(['machine_id', 'test_date', 'result'])
+        self.env.cr.execute("""
+            SELECT date_trunc(%%s, test_date) AS bucket,
+                   COUNT(*) AS total,
+                   COUNT(*) FILTER (WHERE result = 'reject') AS rejected
+              FROM %s
+             WHERE machine_id = %%s
+               AND test_date >= %%s
+               AND test_date < %%s
+             GROUP BY 1
+        """ % ctx.model._table, (ctx.interval, ctx.machine_id, ctx.start_dt, ctx.end_dt))
+
+        # Same labels as _iter_intervals, so buckets line up with the generated intervals
+        label_format = {'hour': '%H:00', 'day': '%Y-%m-%d', 'month': '%Y-%m'}.get(ctx.interval, '%Y')
+        counts = {}
+        for bucket, total, rejected in self.env.cr.fetchall():
+            label = bucket.strftime(label_format)
+            prev_total, prev_rejected = counts.get(label, (0, 0))
+            counts[label] = (prev_total + total, prev_rejected + rejected)
+        ctx.interval_counts = counts
+        return counts
+
+    def _get_production_series(self, ctx):
         labels, values = [], []
-        if not model:
+        if ctx.model is None:
             return {'labels': labels, 'values': values}
 
-        for begin, finish, label in self._iter_intervals(start_dt, end_dt, interval):
-            count = model.search_count([
-                ('machine_id', '=', machine.id),
-                ('test_date', '>=', begin),
-                ('test_date', '<', finish),
-            ])
+        counts = self._get_interval_counts(ctx)
+        for begin, finish, label in self._iter_intervals(ctx.start_dt, ctx.end_dt, ctx.interval):
             labels.append(label)
-            values.append(count)
+            values.append(counts.get(label, (0, 0))[0])
 
         return {'labels': labels, 'values': values}
 
-    def _get_rejection_rate_series(self, machine, start_dt, end_dt, interval):
-        model = self._get_model_for_machine(machine)
+    def _get_rejection_rate_series(self, ctx):
         labels, values = [], []
-        if not model:
+        if ctx.model is None:
             return {'labels': labels, 'values': values}
 
-        for begin, finish, label in self._iter_intervals(start_dt, end_dt, interval):
-            total = model.search_count([
-                ('machine_id', '=', machine.id),
-                ('test_date', '>=', begin),
-                ('test_date', '<', finish),
-            ])
-            rejected = model.search_count([
-                ('machine_id', '=', machine.id),
-                ('test_date', '>=', begin),
-                ('test_date', '<', finish),
-                ('result', '=', 'reject'),
-            ])
+        counts = self._get_interval_counts(ctx)
+        for begin, finish, label in self._iter_intervals(ctx.start_dt, ctx.end_dt, ctx.interval):
+            total, rejected = counts.get(label, (0, 0))
             rate = round((rejected / total) * 100, 2) if total else 0.0
             labels.append(label)
             values.append(rate)
 
         return {'labels': labels, 'values': values}
 
-    def _get_measurement_average(self, machine, start_dt, end_dt):
-        model = self._get_model_for_machine(machine)
-        if not model:
+    def _get_measurement_average(self, ctx):
+        model = ctx.model
+        if model is None:
             return {'labels': [], 'values': []}
 
         domain = [
-            ('machine_id', '=', machine.id),
-            ('test_date', '>=', start_dt),
-            ('test_date', '<', end_dt),
+            ('machine_id', '=', ctx.machine_id),
+            ('test_date', '>=', ctx.start_dt),
+            ('test_date', '<', ctx.end_dt),
         ]
-        records = model.search(domain, limit=500)  # reasonable cap
-
-        labels, values = [], []
-        if machine.machine_type == 'vici_vision':
-            fields_list = ['l_64_8', 'l_35_4', 'l_46_6', 'l_82', 'l_128_6', 'l_164']
-            labels = ['L 64.8', 'L 35.4', 'L 46.6', 'L 82', 'L 128.6', 'L 164']
-        elif machine.machine_type == 'aumann':
-            fields_list = ['diameter_journal_a1', 'diameter_journal_a2', 'diameter_journal_b1', 'diameter_journal_b2']
-            labels = ['Diameter A1', 'Diameter A2', 'Diameter B1', 'Diameter B2']
-        elif machine.machine_type == 'gauging':
-            fields_list = ['angle_degrees', 'measurement_value']
-            labels = ['Angle (Degrees)', 'Measurement Value']
-        else:
-            fields_list = []
-
-        for idx, f in enumerate(fields_list):
-            vals = []
-            for r in records:
-                v = getattr(r, f, 0) or 0
-                try:
-                    vals.append(float(v))
-                except Exception:
-                    continue
-            avg = round(sum(vals) / len(vals), 3) if vals else 0.0
-            values.append(avg)
-
-        return {'labels': labels, 'values': values}
 
-    def _get_measurement_trends(self, machine_id, date):
-        """Get measurement trends for radar charts"""
-        machine = self.browse(machine_id)
-        trends = {}
-
-        if machine.machine_type == 'vici_vision':
-            # Get latest records for trend analysis
-            records = self.env['manufacturing.vici.vision'].search([
-                ('machine_id', '=', machine_id),
-                ('test_date', '>=', date),
-                ('result', '=', 'pass')  # Only include passed parts for trend
-            ], limit=10, order='test_date desc')
-
-            if records:
-                # Calculate average values for key measurements
-                measurements = ['l_64_8', 'l_35_4', 'l_46_6', 'l_82', 'l_128_6', 'l_164']
-                for measurement in measurements:
-                    values = [getattr(r, measurement, 0) or 0 for r in records]
-                    if values:
-                        trends[measurement] = sum(values) / len(values)
-
-        elif machine.machine_type == 'aumann':
-            records = self.env['manufacturing.aumann.measurement'].search([
-                ('machine_id', '=', machine_id),
-                ('test_date', '>=', date),
-                ('result', '=', 'pass')
-            ], limit=10, order='test_date desc')
-
-            if records:
-                measurements = ['diameter_journal_a1', 'diameter_journal_a2', 'diameter_journal_b1']
-                for measurement in measurements:
-                    values = [getattr(r, measurement, 0) or 0 for r in records]
-                    if values:
-                        trends[measurement] = sum(values) / len(values)
-
-        return trends
-
-    def _get_quality_metrics(self, machine_id, date):
-        """Get quality metrics for analysis"""
-        machine = self.browse(machine_id)
-
-        # Get data for the last 7 days
-        start_date = date - timedelta(days=6)
-        daily_metrics = []
-
-        for i in range(7):
-            current_date = start_date + timedelta(days=i)
-            next_date = current_date + timedelta(days=1)
-
-            if machine.machine_type == 'vici_vision':
-                total = self.env['manufacturing.vici.vision'].search_count([
-                    ('machine_id', '=', machine_id),
-                    ('test_date', '>=', current_date),
-                    ('test_date', '<', next_date)
-                ])
-                passed = self.env['manufacturing.vici.vision'].search_count([
-                    ('machine_id', '=', machine_id),
-                    ('test_date', '>=', current_date),
-                    ('test_date', '<', next_date),
-                    ('result', '=', 'pass')
-                ])
-            elif machine.machine_type == 'ruhlamat':
-                total = self.env['manufacturing.ruhlamat.press'].search_count([
-                    ('machine_id', '=', machine_id),
-                    ('test_date', '>=', current_date),
-                    ('test_date', '<', next_date)
-                ])
-                passed = self.env['manufacturing.ruhlamat.press'].search_count([
-                    ('machine_id', '=', machine_id),
-                    ('test_date', '>=', current_date),
-                    ('test_date', '<', next_date),
-                    ('result', '=', 'pass')
-                ])
-            elif machine.machine_type == 'aumann':
-                total = self.env['manufacturing.aumann.measurement'].search_count([
-                    ('machine_id', '=', machine_id),
-                    ('test_date', '>=', current_date),
-                    ('test_date', '<', next_date)
-                ])
-                passed = self.env['manufacturing.aumann.measurement'].search_count([
-                    ('machine_id', '=', machine_id),
-                    ('test_date', '>=', current_date),
-                    ('test_date', '<', next_date),
-                    ('result', '=', 'pass')
-                ])
-            else:
-                total = passed = 0
+        trend_fields = TREND_FIELDS.get(ctx.machine_type, ())
+        fields_list = [field for field, _label in trend_fields]
+        labels = [label for _field, label in trend_fields]
 
-            rejection_rate = 0
-            if total > 0:
-                rejection_rate = ((total - passed) / total) * 100
+        # Search and load all averaged columns in a single query so the loop below only hits the cache
+        records = model.search_fetch(domain, fields_list, limit=500)  # reasonable cap
 
-            daily_metrics.append({
-                'date': current_date.strftime('%Y-%m-%d'),
-                'total_parts': total,
-                'passed_parts': passed,
-                'rejected_parts': total - passed,
-                'rejection_rate': round(rejection_rate, 2)
-            })
+        # Float fields always come back as float (0.0 when empty), so no per-value coercion is needed
+        matrix = np.array([[r[f] or 0.0 for f in fields_list] for r in records],
+                          dtype=np.float64).reshape(len(records), len(fields_list))
+        values = [round(float(avg), 3) for avg in _column_means(matrix)]
 
-        return daily_metrics
+        return {'labels': labels, 'values': values}
 
     # Final Station Methods
     def test_plc_connection(self):
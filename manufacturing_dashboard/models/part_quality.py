@@ -1,11 +1,35 @@
 # -*- coding: utf-8 -*-
 
-from odoo import models, fields, api
+from odoo import models, fields, api, tools
 import logging
-import pytz
+from collections import defaultdict
+from datetime import timedelta
+from .timezones import IST_TZ, UTC_TZ
 
 _logger = logging.getLogger(__name__)
 
+# Result vocabulary shared by the station result fields and the final result compute
+_PENDING = 'pending'
+_PASS = 'pass'
+_REJECT = 'reject'
+_BYPASS = 'bypass'
+
+# One bit per station result so the final result compute ORs four lookups instead of comparing strings;
+# anything unexpected (e.g. an empty result) counts as pending
+_PASS_BIT, _REJECT_BIT, _BYPASS_BIT, _PENDING_BIT = 1, 2, 4, 8
+_RESULT_BITS = {_PASS: _PASS_BIT, _REJECT: _REJECT_BIT, _BYPASS: _BYPASS_BIT, _PENDING: _PENDING_BIT}
+# Width of one station's slot in station_bitmap, and the mask selecting a single slot
+_STATION_BITS = 4
+_STATION_MASK = (1 << _STATION_BITS) - 1
+
+# Shared by the four station result fields
+_STATION_RESULT_SELECTION = [
+    ('pending', 'Pending'),
+    ('pass', 'Pass'),
+    ('reject', 'Reject'),
+    ('bypass', 'Bypass')
+]
+
 
 class PartQuality(models.Model):
     _name = 'manufacturing.part.quality'
@@ -14,19 +38,24 @@ class PartQuality(models.Model):
     _order = 'test_date desc'
     _rec_name = 'serial_number'
 
+    # Serial number prefix -> part variant, and part variant -> description
+    _VARIANT_PREFIX_MAP = {'480': 'exhaust', '980': 'intake'}
+    _DESCRIPTION_MAP = {'exhaust': 'Exhaust Camshaft', 'intake': 'Intake Camshaft'}
+
+    # Stations a part goes through; each has a '<station>_result' field
+    _STATIONS = ('vici', 'ruhlamat', 'aumann', 'gauging')
+    _STATION_RESULT_FIELDS = tuple(f'{station}_result' for station in _STATIONS)
+    # Offset of each station's slot in station_bitmap, in _STATIONS order
+    _STATION_SHIFTS = tuple(_STATION_BITS * i for i in range(len(_STATIONS)))
+
+    # Fields final_result is computed from, plus final_result itself for QE overrides
+    _FINAL_RESULT_TRIGGERS = frozenset(_STATION_RESULT_FIELDS + ('qe_override', 'final_result'))
+
     @api.model
     def get_ist_now(self):
         """Get current IST datetime for consistent timezone handling"""
-        try:
-            ist = pytz.timezone('Asia/Kolkata')
-            utc_now = fields.Datetime.now()
-            # Convert UTC to IST
-            ist_now = pytz.UTC.localize(utc_now).astimezone(ist)
-            # Return as naive datetime in IST (Odoo will handle display)
-            return ist_now.replace(tzinfo=None)
-        except Exception as e:
-            _logger.warning(f"Error getting IST time: {e}, falling back to UTC")
-            return fields.Datetime.now()
+        # Convert UTC to IST and return it naive (Odoo will handle display)
+        return UTC_TZ.localize(fields.Datetime.now()).astimezone(IST_TZ).replace(tzinfo=None)
 
     serial_number = fields.Char('Serial Number', required=True, index=True)
     test_date = fields.Datetime('Test Date', index=True)
@@ -35,45 +64,28 @@ class PartQuality(models.Model):
     part_variant = fields.Selection([
         ('exhaust', 'Exhaust'),
         ('intake', 'Intake')
-    ], compute='_compute_part_variant', string='Part Variant', store=True)
+    ], compute='_compute_part_variant', string='Part Variant', store=True, precompute=True)
     
-    part_description = fields.Char('Part Description', compute='_compute_part_description', store=True,translate=True)
+    part_description = fields.Char('Part Description', compute='_compute_part_description', translate=True)
 
     # Station results
-    vici_result = fields.Selection([
-        ('pending', 'Pending'),
-        ('pass', 'Pass'),
-        ('reject', 'Reject'),
-        ('bypass', 'Bypass')
-    ], default='pending', string='VICI Result')
+    vici_result = fields.Selection(_STATION_RESULT_SELECTION, default=_PENDING, string='VICI Result')
 
-    ruhlamat_result = fields.Selection([
-        ('pending', 'Pending'),
-        ('pass', 'Pass'),
-        ('reject', 'Reject'),
-        ('bypass', 'Bypass')
-    ], default='pending', string='Ruhlamat Result')
+    ruhlamat_result = fields.Selection(_STATION_RESULT_SELECTION, default=_PENDING, string='Ruhlamat Result')
 
-    aumann_result = fields.Selection([
-        ('pending', 'Pending'),
-        ('pass', 'Pass'),
-        ('reject', 'Reject'),
-        ('bypass', 'Bypass')
-    ], default='pending', string='Aumann Result')
+    aumann_result = fields.Selection(_STATION_RESULT_SELECTION, default=_PENDING, string='Aumann Result')
 
-    gauging_result = fields.Selection([
-        ('pending', 'Pending'),
-        ('pass', 'Pass'),
-        ('reject', 'Reject'),
-        ('bypass', 'Bypass')
-    ], default='pending', string='Gauging Result')
+    gauging_result = fields.Selection(_STATION_RESULT_SELECTION, default=_PENDING, string='Gauging Result')
+
+    # Station results packed into one integer, one 4-bit slot per station in _STATIONS order (VICI lowest)
+    station_bitmap = fields.Integer('Station Bitmap', compute='_compute_station_bitmap', store=True, index=True)
 
     # Final result
     final_result = fields.Selection([
         ('pending', 'Pending'),
         ('pass', 'Pass'),
         ('reject', 'Reject')
-    ], compute='_compute_final_result', string='Final Result', store=True)
+    ], compute='_compute_final_result', string='Final Result', store=True, index=True)
 
     # Box tracking
     box_number = fields.Char('Box Number')
@@ -111,62 +123,98 @@ class PartQuality(models.Model):
         string='Gauging Tests'
     )
 
+    def init(self):
+        """Indexes backing the daily stats aggregation and the rejected-in-box cleanup"""
+        tools.create_index(self.env.cr, 'manufacturing_part_quality_date_result_variant_idx',
+                           self._table, ['test_date', 'final_result', 'part_variant'])
+        # Partial: only the (normally empty) set of rejected parts still sitting in a box
+        tools.create_index(self.env.cr, 'manufacturing_part_quality_reject_boxed_idx',
+                           self._table, ['box_id'],
+                           where="final_result = 'reject' AND box_id IS NOT NULL")
+
     @api.depends('serial_number')
     def _compute_part_variant(self):
         """Detect part variant based on serial number prefix"""
         for record in self:
-            if record.serial_number:
-                if record.serial_number.startswith('480'):
-                    record.part_variant = 'exhaust'
-                elif record.serial_number.startswith('980'):
-                    record.part_variant = 'intake'
-                else:
-                    record.part_variant = False
-            else:
-                record.part_variant = False
+            sn = record.serial_number
+            part_variant = self._VARIANT_PREFIX_MAP.get(sn[:3], False) if sn else False
+            # Skip no-op assignments so the variant and its dependents are not marked dirty;
+            # records still being created (precompute) always need the value
+            if not record.id or record.part_variant != part_variant:
+                record.part_variant = part_variant
 
     @api.depends('part_variant')
     def _compute_part_description(self):
         """Set part description based on variant"""
+        # Not stored: a constant label per variant is cheaper to derive on read than to write per part
         for record in self:
-            if record.part_variant == 'exhaust':
-                record.part_description = 'Exhaust Camshaft'
-            elif record.part_variant == 'intake':
-                record.part_description = 'Intake Camshaft'
-            else:
-                record.part_description = 'Unknown Part'
+            record.part_description = self._DESCRIPTION_MAP.get(record.part_variant, 'Unknown Part')
 
-    @api.depends('vici_result', 'ruhlamat_result', 'aumann_result', 'gauging_result', 'qe_override')
-    def _compute_final_result(self):
+    @api.depends('vici_result', 'ruhlamat_result', 'aumann_result', 'gauging_result')
+    def _compute_station_bitmap(self):
         for record in self:
-            if record.qe_override:
-                # If QE has overridden, keep current final_result
-                continue
-
-            # Use actual results from part_quality fields (bypass status is already set in the fields)
-            results = [record.vici_result, record.ruhlamat_result, record.aumann_result, record.gauging_result]
-
-            # Determine final result logic:
-            # - If ANY station is reject -> reject
-            # - If ALL stations are pass or bypass -> pass
-            # - If ANY station is bypass and no reject -> pass
-            # - Otherwise -> pending
-            old_result = record.final_result
-            
-            if 'reject' in results:
-                record.final_result = 'reject'
-                # If part was previously passed and assigned to box, remove it
-                if old_result == 'pass' and record.box_id:
-                    record._remove_from_box_if_rejected()
-            elif all(result in ('pass', 'bypass') for result in results):
-                record.final_result = 'pass'
-            elif 'bypass' in results and 'reject' not in results:
-                record.final_result = 'pass'  # Pass if any station is bypassed and no failures
+            bitmap = 0
+            for shift, field_name in zip(self._STATION_SHIFTS, self._STATION_RESULT_FIELDS):
+                bitmap |= _RESULT_BITS.get(record[field_name], _PENDING_BIT) << shift
+            record.station_bitmap = bitmap
+
+    @api.depends('station_bitmap', 'qe_override')
+    def _compute_final_result(self):
+        # Load the fields read below in one query each instead of letting every access miss the cache
+        # (new records from onchange have no row to fetch)
+        self.filtered('id').fetch(['qe_override'])
+
+        # If QE has overridden, keep current final_result: stored computes keep their value when
+        # left unassigned, so overridden parts are dropped here and never touch their station fields
+        todo = self.filtered(lambda r: not r.qe_override)
+        if not todo:
+            return
+        todo.filtered('id').fetch(['station_bitmap', 'final_result'])
+
+        # Determine final result logic, assigned per bucket instead of per record:
+        # - If ANY station is reject -> reject
+        # - If ALL stations are pass or bypass -> pass
+        # - If ANY station is bypass and no reject -> pass
+        # - Otherwise -> pending
+        to_assign = {_REJECT: [], _PASS: [], _PENDING: []}
+        shifts = self._STATION_SHIFTS
+        for record in todo:
+            # Fold the station slots onto each other: a bit is set if any station has that result
+            # (bypass status is already set in the station result fields)
+            bitmap = record.station_bitmap
+            mask = 0
+            for shift in shifts:
+                mask |= bitmap >> shift
+            mask &= _STATION_MASK
+            if mask & _REJECT_BIT:
+                new_result = _REJECT
+            elif mask & _BYPASS_BIT or mask == _PASS_BIT:
+                new_result = _PASS
             else:
-                record.final_result = 'pending'
-                # If part was previously passed and assigned to box, remove it
-                if old_result == 'pass' and record.box_id:
-                    record._remove_from_box_if_rejected()
+                new_result = _PENDING
+
+            # Only assign changed results: re-assigning the same value still flushes an UPDATE
+            if record.final_result != new_result:
+                to_assign[new_result].append(record.id)
+
+        for result, ids in to_assign.items():
+            if ids:
+                todo.browse(ids).final_result = result
+
+    def write(self, vals):
+        # Only writes that can move final_result need the before/after comparison
+        if not self._FINAL_RESULT_TRIGGERS.intersection(vals):
+            return super().write(vals)
+
+        # Boxed parts that pass now must leave their box if this write makes them rejected
+        old_finals = {r.id: r.final_result for r in self if r.box_id}
+        res = super().write(vals)
+
+        rejected = self.filtered(
+            lambda r: old_finals.get(r.id) == 'pass' and r.final_result == 'reject' and r.box_id
+        )
+        rejected._remove_from_box_if_rejected()
+        return res
     
     def _get_machine_bypass_status(self):
         """Get current bypass status for all machines"""
@@ -189,39 +237,59 @@ class PartQuality(models.Model):
             return {}
 
     def _assign_to_box_if_passed(self):
-        """Assign part to box only when passed and scanned at final station"""
-        self.ensure_one()
+        """Assign parts to boxes only when passed and scanned at final station"""
+        self._assign_to_box_batch()
+
+    def _assign_to_box_batch(self):
+        """Assign every eligible part in self to the current box of its variant
         
+        Parts are grouped per variant so each variant looks up its open box once and
+        fills it with one write instead of one box lookup and write per part.
+        """
         # Only assign if: not already assigned, final_result == pass, scanned at final station, and valid variant
-        if not self.box_id and self.final_result == 'pass' and self.final_station_scanned and self.part_variant:
+        ids_by_variant = defaultdict(list)
+        for part in self:
+            if not part.box_id and part.final_result == 'pass' and part.final_station_scanned and part.part_variant:
+                ids_by_variant[part.part_variant].append(part.id)
+
+        box_management = self.env['manufacturing.box.management']
+        for variant, pending_ids in ids_by_variant.items():
             try:
-                box_management = self.env['manufacturing.box.management']
-                current_box = box_management.get_or_create_current_box(self.part_variant)
-                position = current_box.add_part_to_box(self.id)
-                
-                _logger.info(f"Assigned {self.part_variant} part {self.serial_number} to box {current_box.box_number} at position {position}")
-                
+                # A full box is completed by add_parts_to_box, so the next lookup opens a fresh one
+                while pending_ids:
+                    current_box = box_management.get_or_create_current_box(variant)
+                    added_ids = current_box.add_parts_to_box(pending_ids)
+                    pending_ids = pending_ids[len(added_ids):]
+                    
+                    _logger.info("Assigned %s %s part(s) to box %s", len(added_ids), variant, current_box.box_number)
+                    
             except Exception as e:
-                _logger.error(f"Error assigning part {self.serial_number} to box: {str(e)}")
+                _logger.error(f"Error assigning {variant} parts to box: {str(e)}")
 
     def _remove_from_box_if_rejected(self):
-        """Remove part from box if it's rejected"""
-        self.ensure_one()
-        
+        """Remove parts from their box if they're rejected"""
         # Only remove if currently assigned to a box and final result is reject
-        if self.box_id and self.final_result == 'reject':
-            try:
-                box_number = self.box_number
-                self.write({
-                    'box_id': False,
-                    'box_number': False,
-                    'box_position': 0
-                })
-                
-                _logger.info(f"Removed rejected {self.part_variant} part {self.serial_number} from box {box_number}")
-                
-            except Exception as e:
-                _logger.error(f"Error removing rejected part {self.serial_number} from box: {str(e)}")
+        rejected = self.filtered(lambda r: r.box_id and r.final_result == 'reject')
+        if not rejected:
+            return
+
+        # Read the log details before the write clears box_number; mapped() loads each column for the whole batch at once
+        log_info = _logger.isEnabledFor(logging.INFO)
+        log_rows = list(zip(rejected.mapped('part_variant'), rejected.mapped('serial_number'),
+                            rejected.mapped('box_number'))) if log_info else []
+        try:
+            # Surgical write: the parts are not read again, so hooks must not prefetch all their fields
+            rejected.with_context(prefetch_fields=False).write({
+                'box_id': False,
+                'box_number': False,
+                'box_position': 0
+            })
+            
+            for part_variant, serial_number, box_number in log_rows:
+                _logger.info("Removed rejected %s part %s from box %s", part_variant, serial_number, box_number)
+            
+        except Exception as e:
+            _logger.error(f"Error removing rejected parts {', '.join(filter(None, rejected.mapped('serial_number')))} from box: {str(e)}")
 
     def qe_override_result(self, new_result=None, comments=None):
         """Allow Quality Engineer to override the result"""
@@ -238,12 +306,15 @@ class PartQuality(models.Model):
                 'context': {'default_part_quality_id': self.id}
             }
         
-        self.write({
+        # Single write without mail tracking; the QE value must not be recomputed afterwards
+        self.with_context(tracking_disable=True, mail_notrack=True).write({
             'final_result': new_result,
             'test_date': self.get_ist_now(),  # Update test_date to current datetime
             'qe_override': True,
             'qe_comments': comments
         })
+        # qe_override is a dependency of final_result: drop any pending recompute of the overridden value
+        self.env.remove_to_compute(self._fields['final_result'], self)
 
         # Log the override (temporarily disabled chatter)
         # self.message_post(
@@ -260,86 +331,40 @@ class PartQuality(models.Model):
         """
         self.ensure_one()
         
-        station_map = {
-            'vici': 'vici_result',
-            'ruhlamat': 'ruhlamat_result',
-            'aumann': 'aumann_result',
-            'gauging': 'gauging_result'
-        }
-        
-        if station_name not in station_map:
+        if station_name not in self._STATIONS:
             raise ValueError(f"Invalid station name: {station_name}")
         
-        field_name = station_map[station_name]
+        field_name = f'{station_name}_result'
         
         # Update the station result and test_date to current datetime
         # Note: final_result will be automatically recalculated since it depends on station results
+        now = self.get_ist_now()
         self.with_context(skip_station_recalculate=True).write({
             field_name: new_result,
-            'test_date': self.get_ist_now(),  # Update test_date to current datetime
+            'test_date': now,  # Update test_date to current datetime
             'qe_override': True,
             'qe_comments': f"[{station_name.upper()} Override] {comments}"
         })
         
-        _logger.info(f"Station override applied: {station_name} -> {new_result} for serial {self.serial_number}, test_date updated to {self.test_date}")
+        _logger.info("Station override applied: %s -> %s for serial %s, test_date updated to %s",
+                     station_name, new_result, self.serial_number, now)
 
-    def action_override_vici_result(self):
-        """Open wizard to override VICI result"""
-        self.ensure_one()
-        return {
-            'type': 'ir.actions.act_window',
-            'name': 'Override VICI Result',
-            'res_model': 'manufacturing.station.override.wizard',
-            'view_mode': 'form',
-            'target': 'new',
-            'context': {
-                'default_part_quality_id': self.id,
-                'default_station_name': 'vici'
-            }
-        }
-
-    def action_override_ruhlamat_result(self):
-        """Open wizard to override Ruhlamat result"""
-        self.ensure_one()
-        return {
-            'type': 'ir.actions.act_window',
-            'name': 'Override Ruhlamat Result',
-            'res_model': 'manufacturing.station.override.wizard',
-            'view_mode': 'form',
-            'target': 'new',
-            'context': {
-                'default_part_quality_id': self.id,
-                'default_station_name': 'ruhlamat'
-            }
-        }
-
-    def action_override_aumann_result(self):
-        """Open wizard to override Aumann result"""
-        self.ensure_one()
-        return {
-            'type': 'ir.actions.act_window',
-            'name': 'Override Aumann Result',
-            'res_model': 'manufacturing.station.override.wizard',
-            'view_mode': 'form',
-            'target': 'new',
-            'context': {
-                'default_part_quality_id': self.id,
-                'default_station_name': 'aumann'
-            }
-        }
-
-    def action_override_gauging_result(self):
-        """Open wizard to override Gauging result"""
+    def action_override_station(self):
+        """Open wizard to override the result of the station given in the 'station' context key"""
         self.ensure_one()
+        station_name = self.env.context.get('station')
+        if station_name not in self._STATIONS:
+            raise ValueError(f"Invalid station name: {station_name}")
+        
         return {
             'type': 'ir.actions.act_window',
-            'name': 'Override Gauging Result',
+            'name': f"Override {self._fields[f'{station_name}_result'].string}",
             'res_model': 'manufacturing.station.override.wizard',
             'view_mode': 'form',
             'target': 'new',
             'context': {
                 'default_part_quality_id': self.id,
-                'default_station_name': 'gauging'
+                'default_station_name': station_name
             }
         }
 
@@ -513,23 +538,79 @@ class PartQuality(models.Model):
     #
     #     return res
 
+    @api.model
+    def _bulk_upsert(self, vals_list, later_only=()):
+        """Create or update parts keyed by serial number with one search, one create and one write per distinct update
+        
+        Existing parts only receive the values that differ from what they already hold.
+        
+        :param vals_list: List of plain field value dicts, each holding a 'serial_number'; later dicts win for a repeated serial
+        :param later_only: Fields written to an existing part only when the new value is set and later than its current one
+        :return: Recordset of the created and updated parts, one per serial number
+        """
+        vals_by_serial = {}
+        for vals in vals_list:
+            vals_by_serial.setdefault(vals['serial_number'], {}).update(vals)
+        if not vals_by_serial:
+            return self.browse()
+        
+        # Newest record first (_order), so a serial with duplicate rows updates its latest part
+        existing_by_serial = {}
+        for part in self.search([('serial_number', 'in', list(vals_by_serial))]):
+            existing_by_serial.setdefault(part.serial_number, part)
+        
+        # Parts receiving identical values share a single write
+        ids_by_update = defaultdict(list)
+        for serial, part in existing_by_serial.items():
+            update = tuple(sorted(
+                (k, v) for k, v in vals_by_serial[serial].items()
+                if k != 'serial_number' and part[k] != v
+                and (k not in later_only or (v and (not part[k] or v > part[k])))
+            ))
+            if update:
+                ids_by_update[update].append(part.id)
+        for update, ids in ids_by_update.items():
+            self.browse(ids).write(dict(update))
+        
+        to_create = [vals for serial, vals in vals_by_serial.items() if serial not in existing_by_serial]
+        created = self.create(to_create) if to_create else self.browse()
+        
+        return self.browse([part.id for part in existing_by_serial.values()]) | created
+
     @api.model
     def cleanup_rejected_parts_from_boxes(self):
         """Clean up any rejected parts that are still assigned to boxes (data integrity)"""
         try:
-            rejected_parts_in_boxes = self.search([
-                ('final_result', '=', 'reject'),
-                ('box_id', '!=', False)
-            ])
+            # Select and clear in one statement; the CTE hands back the box each part is leaving
+            self.flush_model(['final_result', 'box_id', 'box_number', 'box_position'])
+            self.env.cr.execute("""
+                WITH boxed AS (
+                    SELECT id, box_id, box_number
+                    FROM %s
+                    WHERE final_result = 'reject' AND box_id IS NOT NULL
+                    FOR UPDATE
+                )
+                UPDATE %s part
+                SET box_id = NULL, box_number = NULL, box_position = 0
+                FROM boxed
+                WHERE part.id = boxed.id
+                RETURNING boxed.id, boxed.box_id, boxed.box_number
+            """ % (self._table, self._table))
+            rows = self.env.cr.fetchall()
             
-            if rejected_parts_in_boxes:
-                _logger.info(f"Found {len(rejected_parts_in_boxes)} rejected parts still assigned to boxes - cleaning up")
+            if rows:
+                self.browse([row[0] for row in rows]).invalidate_recordset(['box_id', 'box_number', 'box_position'])
                 
-                for part in rejected_parts_in_boxes:
-                    part._remove_from_box_if_rejected()
+                # The raw UPDATE bypasses the ORM: mark the boxes' part lists as modified so their
+                # stored statistics are recomputed and flushed by the ORM
+                boxes = self.env['manufacturing.box.management'].browse(list({row[1] for row in rows}))
+                boxes.invalidate_recordset(['part_quality_ids'])
+                boxes.modified(['part_quality_ids'])
+                boxes.flush_recordset()
                 
-                _logger.info(f"Cleaned up {len(rejected_parts_in_boxes)} rejected parts from boxes")
-                return len(rejected_parts_in_boxes)
+                box_numbers = sorted({row[2] for row in rows if row[2]})
+                _logger.info(f"Cleaned up {len(rows)} rejected parts from boxes: {', '.join(box_numbers)}")
+                return len(rows)
             else:
                 _logger.info("No rejected parts found in boxes - data integrity is good")
                 return 0
@@ -549,42 +630,58 @@ class PartQuality(models.Model):
             if cleaned_count > 0:
                 _logger.info(f"Data integrity cleanup: Removed {cleaned_count} rejected parts from boxes")
             
-            # Get current IST date
+            # Get current IST date; test_date holds IST wall-clock values, so the bounds stay in IST.
+            # A half-open [today, tomorrow) range gives the index exact bounds with no 23:59:59.999999 edge
             ist_now = self.get_ist_now()
             today_start = ist_now.replace(hour=0, minute=0, second=0, microsecond=0)
-            today_end = ist_now.replace(hour=23, minute=59, second=59, microsecond=999999)
+            tomorrow_start = today_start + timedelta(days=1)
             
-            # Get all parts tested today
-            today_parts = self.search([
-                ('test_date', '>=', today_start),
-                ('test_date', '<=', today_end)
-            ])
+            # Every counter comes out of one scan of today's rows
+            self.flush_model(['test_date', 'final_result', 'part_variant', 'vici_result',
+                              'ruhlamat_result', 'aumann_result', 'gauging_result'])
+            self.env.cr.execute("""
+                SELECT COUNT(*) AS total_parts,
+                       COUNT(*) FILTER (WHERE final_result = 'pass') AS passed_parts,
+                       COUNT(*) FILTER (WHERE final_result = 'reject') AS rejected_parts,
+                       COUNT(*) FILTER (WHERE final_result = 'pending') AS pending_parts,
+                       COUNT(*) FILTER (WHERE part_variant = 'exhaust') AS exhaust_total,
+                       COUNT(*) FILTER (WHERE part_variant = 'intake') AS intake_total,
+                       COUNT(*) FILTER (WHERE part_variant = 'exhaust' AND final_result = 'pass') AS exhaust_passed,
+                       COUNT(*) FILTER (WHERE part_variant = 'intake' AND final_result = 'pass') AS intake_passed,
+                       COUNT(*) FILTER (WHERE vici_result = 'pass') AS vici_passed,
+                       COUNT(*) FILTER (WHERE ruhlamat_result = 'pass') AS ruhlamat_passed,
+                       COUNT(*) FILTER (WHERE aumann_result = 'pass') AS aumann_passed,
+                       COUNT(*) FILTER (WHERE gauging_result = 'pass') AS gauging_passed
+                FROM %s
+                WHERE test_date >= %%s AND test_date < %%s
+            """ % self._table, (today_start, tomorrow_start))
+            stats = self.env.cr.dictfetchall()[0]
             
-            if not today_parts:
+            total_parts = stats['total_parts']
+            if not total_parts:
                 _logger.info("No parts tested today, skipping statistics calculation")
                 return
             
             # Calculate statistics
-            total_parts = len(today_parts)
-            passed_parts = len(today_parts.filtered(lambda p: p.final_result == 'pass'))
-            rejected_parts = len(today_parts.filtered(lambda p: p.final_result == 'reject'))
-            pending_parts = len(today_parts.filtered(lambda p: p.final_result == 'pending'))
+            passed_parts = stats['passed_parts']
+            rejected_parts = stats['rejected_parts']
+            pending_parts = stats['pending_parts']
             
             # Calculate pass rate
             pass_rate = (passed_parts / total_parts * 100) if total_parts > 0 else 0
             
             # Calculate statistics by part variant
-            exhaust_parts = today_parts.filtered(lambda p: p.part_variant == 'exhaust')
-            intake_parts = today_parts.filtered(lambda p: p.part_variant == 'intake')
+            exhaust_total = stats['exhaust_total']
+            intake_total = stats['intake_total']
             
-            exhaust_passed = len(exhaust_parts.filtered(lambda p: p.final_result == 'pass'))
-            intake_passed = len(intake_parts.filtered(lambda p: p.final_result == 'pass'))
+            exhaust_passed = stats['exhaust_passed']
+            intake_passed = stats['intake_passed']
             
             # Calculate station-specific statistics
-            vici_passed = len(today_parts.filtered(lambda p: p.vici_result == 'pass'))
-            ruhlamat_passed = len(today_parts.filtered(lambda p: p.ruhlamat_result == 'pass'))
-            aumann_passed = len(today_parts.filtered(lambda p: p.aumann_result == 'pass'))
-            gauging_passed = len(today_parts.filtered(lambda p: p.gauging_result == 'pass'))
+            vici_passed = stats['vici_passed']
+            ruhlamat_passed = stats['ruhlamat_passed']
+            aumann_passed = stats['aumann_passed']
+            gauging_passed = stats['gauging_passed']
             
             # Log the statistics
             _logger.info(f"=== Daily Statistics for {ist_now.strftime('%Y-%m-%d')} ===")
@@ -593,8 +690,8 @@ class PartQuality(models.Model):
             _logger.info(f"Rejected Parts: {rejected_parts}")
             _logger.info(f"Pending Parts: {pending_parts}")
             _logger.info(f"Overall Pass Rate: {pass_rate:.2f}%")
-            _logger.info(f"Exhaust Parts: {len(exhaust_parts)} (Passed: {exhaust_passed})")
-            _logger.info(f"Intake Parts: {len(intake_parts)} (Passed: {intake_passed})")
+            _logger.info(f"Exhaust Parts: {exhaust_total} (Passed: {exhaust_passed})")
+            _logger.info(f"Intake Parts: {intake_total} (Passed: {intake_passed})")
             _logger.info(f"VICI Passed: {vici_passed}")
             _logger.info(f"Ruhlamat Passed: {ruhlamat_passed}")
             _logger.info(f"Aumann Passed: {aumann_passed}")
@@ -3,13 +3,202 @@
 import threading
 import time
 import socket
+import selectors
 import struct
 import logging
-from datetime import datetime
+from array import array
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 _logger = logging.getLogger(__name__)
 
+# Modbus TCP frame layouts, compiled once instead of re-parsing the format string per scan
+_MBAP_HEADER = struct.Struct('>HHH')          # transaction id, protocol id, length
+_REQUEST = struct.Struct('>HHHBBHH')          # MBAP header + unit, function, address, value/quantity
+_READ_RESPONSE_HEADER = struct.Struct('>HHHBBB')  # MBAP header + unit, function, byte count
+_WRITE_RESPONSE = _REQUEST                    # write single register echoes the request
+_REGISTER = struct.Struct('>H')
+_MAX_ADU = 260  # Largest Modbus TCP frame: 7-byte MBAP header + 253-byte PDU
+
+# Part presence callbacks run on a pool shared by all machines so a slow ORM commit never delays a scan
+_CALLBACK_WORKERS = 8
+_CALLBACK_BACKLOG = 32  # Pending state changes kept per machine; beyond it the oldest is dropped
+
+
+class _ModbusConn:
+    """
+    One Modbus TCP connection shared by every monitor and writer talking to the same PLC/gateway
+    
+    Requests are serialized by a lock and tagged with their own transaction id; the connection
+    is reopened lazily after a failure. Responses are received into one buffer reused for the
+    life of the connection. The socket is non-blocking: each request gets one timeout budget and
+    waits on a selector that wakes as soon as response bytes arrive.
+    """
+    
+    def __init__(self, plc_ip, plc_port, timeout=3):
+        self.plc_ip = plc_ip
+        self.plc_port = plc_port
+        self.timeout = timeout
+        self.sock = None
+        self._selector = None
+        self.lock = threading.Lock()
+        self._transaction_id = 0
+        self._buf = bytearray(_MAX_ADU)
+        self._view = memoryview(self._buf)
+    
+    def _next_transaction_id(self):
+        self._transaction_id = (self._transaction_id + 1) & 0xFFFF
+        return self._transaction_id
+    
+    def _connect(self, timeout):
+        """Open the TCP connection tuned for small request/response frames"""
+        sock = socket.create_connection((self.plc_ip, self.plc_port), timeout=timeout)
+        # Set socket options for better reliability
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setblocking(False)
+        # Registered once per connection and reused by every request on it
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(sock, selectors.EVENT_READ)
+        return sock
+    
+    def close(self):
+        """Close the connection; the next request reopens it"""
+        with self.lock:
+            self._close()
+    
+    def _close(self):
+        """Close the connection, ignoring errors from an already broken socket (lock held)"""
+        if self._selector is not None:
+            self._selector.close()
+            self._selector = None
+        if self.sock is not None:
+            try:
+                self.sock.close()
+            except OSError:
+                pass
+            self.sock = None
+    
+    def _recv_until(self, received, size, deadline):
+        """Fill the buffer up to size bytes; TCP may split a Modbus frame over several segments"""
+        while received < size:
+            try:
+                got = self.sock.recv_into(self._view[received:size])
+            except BlockingIOError:
+                # Nothing buffered yet: wait for data, but only for what is left of the request's budget
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._selector.select(remaining):
+                    raise socket.timeout("PLC response timed out")
+                continue
+            if not got:
+                raise ConnectionError("PLC closed the connection")
+            received += got
+        return received
+    
+    def _exchange(self, function_code, address, value, timeout=None):
+        """
+        Send one Modbus request and receive its response frame into the buffer
+        
+        The caller must hold the lock and read the response before releasing it.
+        timeout overrides the connection's default budget for this request (and its reconnect).
+        
+        Returns:
+            Length of the response frame in the buffer
+        
+        Raises:
+            OSError when the connection failed; it is closed and reopened by the next request
+        """
+        timeout = timeout or self.timeout
+        try:
+            if self.sock is None:
+                self.sock = self._connect(timeout)
+            
+            # Build Modbus TCP frame: MBAP header (protocol 0, length 6, unit 1) + PDU
+            transaction_id = self._next_transaction_id()
+            frame = _REQUEST.pack(transaction_id, 0, 6, 1, function_code, address, value)
+            deadline = time.monotonic() + timeout
+            # A 12-byte request always fits an idle socket's send buffer; anything else means a stalled peer
+            if self.sock.send(frame) != len(frame):
+                raise socket.timeout("PLC send buffer full")
+            
+            # Receive the MBAP header, then as many bytes as its length field announces
+            received = self._recv_until(0, 6, deadline)
+            trans_id, proto_id, length = _MBAP_HEADER.unpack_from(self._buf)
+            if length > _MAX_ADU - 6:
+                raise ConnectionError(f"PLC announced an oversized frame: {length} bytes")
+            received = self._recv_until(received, 6 + length, deadline)
+        except OSError:
+            self._close()
+            raise
+        
+        if trans_id != transaction_id:
+            # A late reply to an earlier, timed-out request: the stream can no longer be trusted
+            self._close()
+            raise ConnectionError(f"PLC transaction id mismatch: sent {transaction_id}, got {trans_id}")
+        return received
+    
+    def read_registers(self, start=0, count=1, timeout=None):
+        """
+        Read a contiguous block of holding registers in one round trip (at most 125 per request)
+        
+        Returns:
+            Tuple of register values, None on an invalid response
+        """
+        with self.lock:
+            received = self._exchange(0x03, start, count, timeout)  # Read Holding Registers
+            
+            if received >= 9:
+                # Parse response header
+                trans_id, proto_id, length, unit, func_code, byte_count = _READ_RESPONSE_HEADER.unpack_from(self._buf)
+                
+                if func_code == 0x03 and byte_count >= 2 * count and received >= 9 + 2 * count:
+                    # Extract all register values at once
+                    if count == 1:
+                        return _REGISTER.unpack_from(self._buf, 9)
+                    return struct.unpack_from(f'>{count}H', self._buf, 9)
+                else:
+                    _logger.warning(f"Invalid PLC response: func_code={func_code}, byte_count={byte_count}")
+                    return None
+            else:
+                _logger.warning(f"Short PLC response: {received} bytes")
+                return None
+    
+    def read_register(self, register=0, timeout=None):
+        """
+        Read a single holding register
+        
+        Returns:
+            True/False for part presence, None on an invalid response
+        """
+        values = self.read_registers(register, 1, timeout)
+        if values is None:
+            return None
+        # For part presence (D0), return True if value is 1
+        return values[0] == 1
+    
+    def write_register(self, register, value, timeout=None):
+        """
+        Write a single holding register
+        
+        Returns:
+            True when the PLC echoed the write, False otherwise
+        """
+        with self.lock:
+            received = self._exchange(0x06, register, value, timeout)  # Write Single Register
+            
+            if received >= 12:
+                # Parse response
+                trans_id, proto_id, length, unit, func_code, reg_addr, reg_value = _WRITE_RESPONSE.unpack_from(self._buf)
+                
+                if func_code == 0x06 and reg_addr == register and reg_value == value:
+                    return True
+                else:
+                    _logger.warning(f"PLC write verification failed")
+                    return False
+            else:
+                _logger.warning(f"Short PLC write response: {received} bytes")
+                return False
+
 
 class PLCMonitorService:
     """
@@ -21,7 +210,72 @@ class PLCMonitorService:
         self.monitors = {}  # Dictionary of machine_id -> monitor thread
         self.stop_events = {}  # Dictionary of machine_id -> stop event
         self.lock = threading.Lock()
+        self._monitor_addresses = {}  # Dictionary of machine_id -> (plc_ip, plc_port) it monitors
+        self._pools = {}  # Dictionary of (plc_ip, plc_port) -> shared _ModbusConn
+        self._pools_lock = threading.Lock()
+        self._cb_pool = None  # Shared callback executor, created on first state change
+        self._cb_queues = {}  # Dictionary of machine_id -> pending callback calls, run in order
+        self._cb_draining = set()  # Machines whose queue is being run on the pool
+        self._cb_lock = threading.Lock()
         
+    def _get_connection(self, plc_ip, plc_port):
+        """Shared connection for a PLC address, created on first use (requests may pass their own timeout)"""
+        key = (plc_ip, plc_port)
+        with self._pools_lock:
+            conn = self._pools.get(key)
+            if conn is None:
+                conn = self._pools[key] = _ModbusConn(plc_ip, plc_port)
+            return conn
+    
+    def _release_connections(self, keys):
+        """Close and forget the shared connections of addresses no monitor uses any more"""
+        with self.lock:
+            in_use = set(self._monitor_addresses.values())
+        with self._pools_lock:
+            conns = [self._pools.pop(key) for key in keys if key not in in_use and key in self._pools]
+        for conn in conns:
+            conn.close()
+    
+    def _dispatch_callback(self, machine_id, callback, *args):
+        """
+        Queue a callback call for a machine on the shared pool
+        
+        Calls for one machine run one at a time in the order they were queued. When a machine's
+        backlog is full its oldest pending change is dropped: presence changes are edge events and
+        the newest one reflects the part actually on the station. Polling never waits on callbacks.
+        """
+        with self._cb_lock:
+            queue = self._cb_queues.get(machine_id)
+            if queue is None:
+                queue = self._cb_queues[machine_id] = deque()
+            elif len(queue) >= _CALLBACK_BACKLOG:
+                dropped = queue.popleft()
+                _logger.error(f"Machine {machine_id}: Callback backlog full ({_CALLBACK_BACKLOG}), dropping oldest state change {dropped[1]}")
+            
+            queue.append((callback, args))
+            if machine_id not in self._cb_draining:
+                # No drain running for this machine yet
+                self._cb_draining.add(machine_id)
+                if self._cb_pool is None:
+                    self._cb_pool = ThreadPoolExecutor(max_workers=_CALLBACK_WORKERS, thread_name_prefix='PLCCallback')
+                self._cb_pool.submit(self._drain_callbacks, machine_id, queue)
+            return True
+    
+    def _drain_callbacks(self, machine_id, queue):
+        """Run a machine's queued callback calls until its queue is empty"""
+        while True:
+            with self._cb_lock:
+                if not queue:
+                    self._cb_draining.discard(machine_id)
+                    return
+                callback, args = queue.popleft()
+            try:
+                _logger.info(f"Machine {machine_id}: Calling callback function...")
+                callback(machine_id, *args)
+                _logger.info(f"Machine {machine_id}: Callback function completed")
+            except Exception as cb_error:
+                _logger.error(f"Callback error for machine {machine_id}: {str(cb_error)}")
+    
     def start_monitoring(self, machine_id, config):
         """
         Start continuous monitoring for a machine
@@ -34,14 +288,14 @@ class PLCMonitorService:
                 - scan_rate: Scan rate in seconds (default 0.1)
                 - callback: Function to call when part presence changes
         """
+        # Stop existing monitor if any (outside the lock: stop_monitoring takes it itself)
+        self.stop_monitoring(machine_id)
+        
         with self.lock:
-            # Stop existing monitor if any
-            if machine_id in self.monitors:
-                self.stop_monitoring(machine_id)
-            
             # Create stop event
             stop_event = threading.Event()
             self.stop_events[machine_id] = stop_event
+            self._monitor_addresses[machine_id] = (config.get('plc_ip'), config.get('plc_port', 502))
             
             # Create and start monitor thread
             monitor_thread = threading.Thread(
@@ -60,20 +314,20 @@ class PLCMonitorService:
     def stop_monitoring(self, machine_id):
         """Stop monitoring for a machine"""
         with self.lock:
-            if machine_id in self.stop_events:
-                self.stop_events[machine_id].set()
-                
-            if machine_id in self.monitors:
-                thread = self.monitors[machine_id]
-                thread.join(timeout=5)  # Wait up to 5 seconds for thread to stop
-                
-                del self.monitors[machine_id]
-                del self.stop_events[machine_id]
-                
-                _logger.info(f"Stopped PLC monitoring for machine {machine_id}")
-                return True
-            
+            stop_event = self.stop_events.pop(machine_id, None)
+            thread = self.monitors.pop(machine_id, None)
+            address = self._monitor_addresses.pop(machine_id, None)
+        
+        if stop_event is not None:
+            stop_event.set()
+        if thread is None:
             return False
+        
+        thread.join(timeout=5)  # Wait up to 5 seconds for thread to stop
+        if address is not None:
+            self._release_connections([address])
+        _logger.info(f"Stopped PLC monitoring for machine {machine_id}")
+        return True
     
     def is_monitoring(self, machine_id):
         """Check if monitoring is active for a machine"""
@@ -90,10 +344,33 @@ class PLCMonitorService:
     def stop_all(self):
         """Stop all monitoring threads"""
         with self.lock:
-            machine_ids = list(self.monitors.keys())
+            stop_events = list(self.stop_events.values())
+            monitors = list(self.monitors.items())
+            self.stop_events.clear()
+            self.monitors.clear()
+            self._monitor_addresses.clear()
+        
+        # Signal every loop first, then wait for all of them within one shared 5 second budget
+        for stop_event in stop_events:
+            stop_event.set()
+        deadline = time.monotonic() + 5
+        for machine_id, thread in monitors:
+            thread.join(timeout=max(0, deadline - time.monotonic()))
+            if thread.is_alive():
+                _logger.warning(f"PLC monitoring thread for machine {machine_id} did not stop in time")
+        
+        # Drop every shared socket so a restart begins with fresh connections
+        with self._pools_lock:
+            conns = list(self._pools.values())
+            self._pools.clear()
+        for conn in conns:
+            conn.close()
         
-        for machine_id in machine_ids:
-            self.stop_monitoring(machine_id)
+        # Let queued callbacks finish in the background; a later start creates a fresh pool
+        with self._cb_lock:
+            if self._cb_pool is not None:
+                self._cb_pool.shutdown(wait=False)
+                self._cb_pool = None
         
         _logger.info("Stopped all PLC monitoring")
     
@@ -117,15 +394,31 @@ class PLCMonitorService:
         reconnect_delay = 5
         last_connection_status = None  # Track connection status changes
         
-        # Performance tracking
-        scan_times = deque(maxlen=100)  # Track last 100 scan times
+        # Performance tracking: ring of the last 100 scan times with a running sum
+        scan_window = 100
+        scan_ring = array('d', [0.0] * scan_window)
+        scan_idx = 0
+        scan_sum = 0.0
+        scan_count = 0  # Successful reads on this machine's loop
+        
+        # Connection shared with every other monitor/writer on this PLC address, kept open across scans
+        conn = self._get_connection(plc_ip, plc_port)
+        
+        # Scans run on a fixed monotonic grid, so the cadence neither drifts nor follows wall-clock jumps
+        next_deadline = time.monotonic() + scan_rate
+        overrun_logged = False
         
         while not stop_event.is_set():
-            scan_start = time.time()
+            scan_start = time.monotonic()
             
             try:
                 # Read part presence from PLC D0 register
-                part_present = self._read_plc_register(plc_ip, plc_port, register=0)
+                part_present = None
+                try:
+                    part_present = conn.read_register(0)
+                except OSError as e:
+                    # socket.timeout is an OSError too; the connection reopens on the next read
+                    _logger.debug(f"PLC read error for {plc_ip}:{plc_port}: {str(e)}")
                 
                 # Check connection status
                 current_connection_status = part_present is not None
@@ -145,13 +438,9 @@ class PLCMonitorService:
                     consecutive_errors = 0
                     
                     # Log current state every 10 scans (for debugging)
-                    if hasattr(self, '_scan_count'):
-                        self._scan_count += 1
-                    else:
-                        self._scan_count = 1
-                    
-                    if self._scan_count % 10 == 0:  # Log every 10th scan
-                        _logger.info(f"Machine {machine_id}: D0={part_present} (scan #{self._scan_count})")
+                    scan_count += 1
+                    if scan_count % 10 == 0:  # Log every 10th scan
+                        _logger.info(f"Machine {machine_id}: D0={part_present} (scan #{scan_count})")
                     
                     # Detect state change
                     if part_present != previous_part_present:
@@ -159,12 +448,7 @@ class PLCMonitorService:
                         
                         # Call callback function with state change
                         if callback:
-                            try:
-                                _logger.info(f"Machine {machine_id}: Calling callback function...")
-                                callback(machine_id, part_present, previous_part_present)
-                                _logger.info(f"Machine {machine_id}: Callback function completed")
-                            except Exception as cb_error:
-                                _logger.error(f"Callback error for machine {machine_id}: {str(cb_error)}")
+                            self._dispatch_callback(machine_id, callback, part_present, previous_part_present)
                         else:
                             _logger.warning(f"Machine {machine_id}: No callback function provided")
                         
@@ -181,18 +465,30 @@ class PLCMonitorService:
                         consecutive_errors = 0  # Reset counter after pause
                 
                 # Track scan performance
-                scan_duration = time.time() - scan_start
-                scan_times.append(scan_duration)
+                scan_end = time.monotonic()
+                scan_duration = scan_end - scan_start
+                scan_sum += scan_duration - scan_ring[scan_idx]
+                scan_ring[scan_idx] = scan_duration
+                scan_idx += 1
                 
                 # Log performance periodically (every 100 scans)
-                if len(scan_times) == 100:
-                    avg_scan_time = sum(scan_times) / len(scan_times)
+                if scan_idx == scan_window:
+                    scan_idx = 0
+                    avg_scan_time = scan_sum / scan_window
                     _logger.debug(f"Machine {machine_id}: Avg scan time: {avg_scan_time*1000:.2f}ms")
                 
-                # Sleep for remaining scan time
-                sleep_time = max(0, scan_rate - scan_duration)
+                # Sleep until the next slot on the grid
+                sleep_time = next_deadline - scan_end
                 if sleep_time > 0:
                     stop_event.wait(sleep_time)
+                    overrun_logged = False
+                elif sleep_time < -scan_rate:
+                    # Missed whole periods (slow PLC, error pause): restart the grid instead of bursting to catch up
+                    if not overrun_logged:
+                        _logger.warning(f"Machine {machine_id}: Scan overrun by {-sleep_time*1000:.0f}ms, resetting schedule")
+                        overrun_logged = True
+                    next_deadline = scan_end
+                next_deadline += scan_rate
                 
             except Exception as e:
                 _logger.error(f"Error in monitor loop for machine {machine_id}: {str(e)}")
@@ -203,66 +499,19 @@ class PLCMonitorService:
     
     def _read_plc_register(self, plc_ip, plc_port, register=0, timeout=3):
         """
-        Read a single holding register from PLC using Modbus TCP with improved reliability
+        Read a single holding register from PLC using Modbus TCP over the shared connection
         
         Args:
             plc_ip: PLC IP address
             plc_port: PLC port
             register: Register address (D0=0, D1=1, etc.)
-            timeout: Socket timeout in seconds
+            timeout: Timeout in seconds for this request, including a reconnect if one is needed
             
         Returns:
             True/False for part presence, None on error
         """
         try:
-            with socket.create_connection((plc_ip, plc_port), timeout=timeout) as sock:
-                # Set socket options for better reliability
-                sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
-                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
-                
-                # Create Modbus TCP read holding registers request
-                transaction_id = 1
-                protocol_id = 0
-                length = 6
-                unit_id = 1
-                function_code = 0x03  # Read Holding Registers
-                starting_address = register
-                quantity = 1
-                
-                # Build Modbus TCP frame
-                frame = struct.pack('>HHHBBHH', 
-                                  transaction_id, 
-                                  protocol_id, 
-                                  length, 
-                                  unit_id, 
-                                  function_code, 
-                                  starting_address, 
-                                  quantity)
-                
-                # Send request
-                sock.sendall(frame)
-                time.sleep(0.05)  # Small delay for stability
-                
-                # Receive response
-                response = sock.recv(1024)
-                
-                if len(response) >= 9:
-                    # Parse response header
-                    trans_id, proto_id, length, unit, func_code, byte_count = struct.unpack('>HHHBBB', response[:9])
-                    
-                    if func_code == 0x03 and byte_count >= 2:
-                        # Extract register value
-                        register_value = struct.unpack('>H', response[9:11])[0]
-                        
-                        # For part presence (D0), return True if value is 1
-                        return (register_value == 1)
-                    else:
-                        _logger.warning(f"Invalid PLC response: func_code={func_code}, byte_count={byte_count}")
-                        return None
-                else:
-                    _logger.warning(f"Short PLC response: {len(response)} bytes")
-                    return None
-                    
+            return self._get_connection(plc_ip, plc_port).read_register(register, timeout)
         except socket.timeout:
             _logger.debug(f"PLC read timeout for {plc_ip}:{plc_port}")
             return None
@@ -272,56 +521,20 @@ class PLCMonitorService:
     
     def write_plc_register(self, plc_ip, plc_port, register, value, timeout=2):
         """
-        Write a single holding register to PLC using Modbus TCP
+        Write a single holding register to PLC using Modbus TCP over the shared connection
         
         Args:
             plc_ip: PLC IP address
             plc_port: PLC port
             register: Register address (D0=0, D1=1, etc.)
             value: Value to write (0-65535)
-            timeout: Socket timeout in seconds
+            timeout: Timeout in seconds for this request, including a reconnect if one is needed
             
         Returns:
             True on success, False on error
         """
         try:
-            with socket.create_connection((plc_ip, plc_port), timeout=timeout) as sock:
-                # Create Modbus TCP write single register request
-                transaction_id = 1
-                protocol_id = 0
-                length = 6
-                unit_id = 1
-                function_code = 0x06  # Write Single Register
-                
-                # Build Modbus TCP frame
-                frame = struct.pack('>HHHBBHH', 
-                                  transaction_id, 
-                                  protocol_id, 
-                                  length, 
-                                  unit_id, 
-                                  function_code, 
-                                  register, 
-                                  value)
-                
-                # Send request
-                sock.sendall(frame)
-                
-                # Receive response
-                response = sock.recv(1024)
-                
-                if len(response) >= 12:
-                    # Parse response
-                    trans_id, proto_id, length, unit, func_code, reg_addr, reg_value = struct.unpack('>HHHBBHH', response[:12])
-                    
-                    if func_code == 0x06 and reg_addr == register and reg_value == value:
-                        return True
-                    else:
-                        _logger.warning(f"PLC write verification failed")
-                        return False
-                else:
-                    _logger.warning(f"Short PLC write response: {len(response)} bytes")
-                    return False
-                    
+            return self._get_connection(plc_ip, plc_port).write_register(register, value, timeout)
         except Exception as e:
             _logger.error(f"PLC write error for {plc_ip}:{plc_port}: {str(e)}")
             return False
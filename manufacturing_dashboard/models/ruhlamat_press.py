@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 
-from odoo import models, fields, api
+from odoo import models, fields, api, tools
 import logging
 
 _logger = logging.getLogger(__name__)
@@ -51,7 +51,7 @@ class RuhlamatPress(models.Model):
     custom_string1 = fields.Char('Custom String 1')
     custom_string2 = fields.Char('Custom String 2')
     custom_string3 = fields.Char('Custom String 3')
-    custom_xml = fields.Text('Custom XML')
+    custom_xml = fields.Text('Custom XML', prefetch=False)  # Loaded only when read, not with every cycle
 
     # Related gaugings
     gauging_ids = fields.One2many('manufacturing.ruhlamat.gauging', 'cycle_id_ref', string='Gaugings')
@@ -83,8 +83,16 @@ class RuhlamatPress(models.Model):
         readonly=False,  # If you want to allow editing it manually
     )
 
+    def init(self):
+        """Composite index backing the per-machine dashboard aggregates on test_date/result"""
+        tools.create_index(self.env.cr, 'manufacturing_ruhlamat_press_machine_date_result_idx',
+                           self._table, ['machine_id', 'test_date', 'result'])
+
     @api.depends('gauging_ids', 'ok_status', 'cycle_status')
     def _compute_result(self):
+        # Load the gaugings of all cycles with the fields used below in one query instead of one per cycle
+        self.gauging_ids.filtered('id').fetch(
+            ['ok_status', 'gauging_status', 'gauging_no', 'gauging_alias', 'actual_y', 'lower_limit', 'upper_limit'])
         for record in self:
             # Check overall cycle status first
             if record.ok_status == -1 or record.cycle_status != 0:
@@ -99,23 +107,40 @@ class RuhlamatPress(models.Model):
                 failed_gaugings = record.gauging_ids.filtered(lambda g: g.ok_status == -1 or g.gauging_status != 0)
                 if failed_gaugings:
                     record.result = 'reject'
-                    failures = []
-                    for g in failed_gaugings:
-                        failure_msg = f"Gauging {g.gauging_no} ({g.gauging_alias})"
-                        if g.actual_y and g.lower_limit and g.upper_limit:
-                            if g.actual_y < g.lower_limit:
-                                failure_msg += f" - Below lower limit ({g.actual_y:.2f} < {g.lower_limit:.2f})"
-                            elif g.actual_y > g.upper_limit:
-                                failure_msg += f" - Above upper limit ({g.actual_y:.2f} > {g.upper_limit:.2f})"
-                        failures.append(failure_msg)
-                    record.rejection_reason = 'Failed gaugings: ' + '; '.join(failures)
+                    record.rejection_reason = 'Failed gaugings: ' + '; '.join(
+                        self._gauging_failure_message(g) for g in failed_gaugings)
                 else:
                     record.result = 'pass'
                     record.rejection_reason = False
 
+    @api.model
+    def _gauging_failure_message(self, gauging):
+        """Describe a failed gauging, with the violated limit when its values are known"""
+        actual_y = gauging.actual_y
+        lower_limit = gauging.lower_limit
+        upper_limit = gauging.upper_limit
+        failure_msg = f"Gauging {gauging.gauging_no} ({gauging.gauging_alias})"
+        # Same test as _compute_tolerance: a 0.0 reading or a single 0.0 bound is a real value
+        if lower_limit or upper_limit:
+            if actual_y < lower_limit:
+                failure_msg += f" - Below lower limit ({actual_y:.2f} < {lower_limit:.2f})"
+            elif actual_y > upper_limit:
+                failure_msg += f" - Above upper limit ({actual_y:.2f} > {upper_limit:.2f})"
+        return failure_msg
+
     @api.depends('gauging_ids')
     def _compute_gauging_stats(self):
-        for record in self:
+        # Let the database count the gaugings of saved cycles; new (onchange) cycles keep the in-memory count
+        saved = self.filtered('id')
+        Gauging = self.env['manufacturing.ruhlamat.gauging']
+        domain = [('cycle_id_ref', 'in', saved.ids)]
+        totals = {cycle.id: count for cycle, count in Gauging._read_group(domain, ['cycle_id_ref'], ['__count'])}
+        passed = {cycle.id: count for cycle, count in Gauging._read_group(
+            domain + [('ok_status', '!=', -1), ('gauging_status', '=', 0)], ['cycle_id_ref'], ['__count'])}
+        for record in saved:
+            record.total_gaugings = totals.get(record.id, 0)
+            record.passed_gaugings = passed.get(record.id, 0)
+        for record in self - saved:
             record.total_gaugings = len(record.gauging_ids)
             record.passed_gaugings = len(record.gauging_ids.filtered(
                 lambda g: g.ok_status != -1 and g.gauging_status == 0
@@ -124,44 +149,46 @@ class RuhlamatPress(models.Model):
     @api.model_create_multi
     def create(self, vals_list):
         records = super().create(vals_list)
-        for record in records:
-            # Update or create part quality record using part_id1 as serial number
-            if record.part_id1:
-                self._update_part_quality(record)
+        # Update or create part quality records using part_id1 as serial number
+        records._update_part_quality_batch()
         return records
 
     def _update_part_quality(self, record):
-        """Update the corresponding part quality record"""
-        part_quality = self.env['manufacturing.part.quality'].search([
-            ('serial_number', '=', record.part_id1)
-        ], limit=1)
-
-        if not part_quality:
-            part_quality = self.env['manufacturing.part.quality'].create({
+        """Update the part quality record of a single cycle (used by the station override wizard)"""
+        record._update_part_quality_batch()
+
+    def _update_part_quality_batch(self):
+        """Update the corresponding part quality records for all cycles in one pass"""
+        records = self.filtered('part_id1')
+        if not records:
+            return
+        serials = set(records.mapped('part_id1'))
+
+        # Latest cycle_date among all Ruhlamat records with the same part_id1
+        latest_dates = dict(self._read_group(
+            [('part_id1', 'in', list(serials))], ['part_id1'], ['cycle_date:max'],
+        ))
+
+        # The last cycle of a part in this batch sets its result; a new part is dated by its
+        # first cycle when no cycle of it has a date yet
+        vals_by_serial = {}
+        cycles_by_serial = {}
+        for record in records:
+            vals = vals_by_serial.setdefault(record.part_id1, {
                 'serial_number': record.part_id1,
-                'test_date': record.cycle_date,
+                'test_date': latest_dates.get(record.part_id1) or record.cycle_date,
             })
+            vals['ruhlamat_result'] = record.result
+            cycles_by_serial.setdefault(record.part_id1, []).append(record.id)
 
-        # Find the latest cycle_date among all Ruhlamat records with the same part_id1
-        latest_ruhlamat = self.env['manufacturing.ruhlamat.press'].search([
-            ('part_id1', '=', record.part_id1)
-        ], order='cycle_date desc', limit=1)
-        
-        # Update test_date with the latest one if found
-        update_vals = {}
-        if latest_ruhlamat and latest_ruhlamat.cycle_date:
-            if not part_quality.test_date or latest_ruhlamat.cycle_date > part_quality.test_date:
-                update_vals['test_date'] = latest_ruhlamat.cycle_date
-
-        # Update the relationship
-        record.part_quality_id = part_quality.id
-
-        # Update the result - use write with skip flag to prevent recursion
-        if part_quality.ruhlamat_result != record.result:
-            update_vals['ruhlamat_result'] = record.result
-        
-        if update_vals:
-            part_quality.with_context(skip_station_recalculate=True).write(update_vals)
+        # Update the results - use the skip flag to prevent recursion
+        parts = self.env['manufacturing.part.quality'].with_context(skip_station_recalculate=True)._bulk_upsert(
+            list(vals_by_serial.values()), later_only=('test_date',))
+
+        # Update the relationship, one write per part
+        part_by_serial = {part.serial_number: part for part in parts}
+        for serial, cycle_ids in cycles_by_serial.items():
+            self.browse(cycle_ids).part_quality_id = part_by_serial[serial].id
 
     def action_override_result(self):
         """Open wizard to override Ruhlamat result - updates station record first, then syncs to part_quality"""
@@ -257,27 +284,38 @@ class RuhlamatGauging(models.Model):
         store=True
     )
 
+    def init(self):
+        """Composite index backing the per-cycle gauging lookups and pass/fail counts"""
+        tools.create_index(self.env.cr, 'manufacturing_ruhlamat_gauging_cycle_status_idx',
+                           self._table, ['cycle_id_ref', 'ok_status', 'gauging_status'])
+
     @api.depends('cycle_id')
     def _compute_cycle_ref(self):
+        cycle_ids = list(set(self.mapped('cycle_id')))
+        # Newest cycle first (_order), matching the previous per-record search(limit=1)
+        cycle_by_id = {}
+        for cycle in self.env['manufacturing.ruhlamat.press'].search([('cycle_id', 'in', cycle_ids)]):
+            cycle_by_id.setdefault(cycle.cycle_id, cycle.id)
         for record in self:
-            cycle = self.env['manufacturing.ruhlamat.press'].search([
-                ('cycle_id', '=', record.cycle_id)
-            ], limit=1)
-            record.cycle_id_ref = cycle.id if cycle else False
+            record.cycle_id_ref = cycle_by_id.get(record.cycle_id, False)
 
     @api.depends('actual_y', 'lower_limit', 'upper_limit', 'limit_testing')
     def _compute_tolerance(self):
         for record in self:
-            if record.limit_testing == -1 and record.lower_limit and record.upper_limit:
-                if record.lower_limit <= record.actual_y <= record.upper_limit:
+            actual_y = record.actual_y
+            lower_limit = record.lower_limit
+            upper_limit = record.upper_limit
+            # Unset float limits read as 0.0: only a 0/0 pair means no limits, a single 0.0 bound is a real limit
+            if record.limit_testing == -1 and (lower_limit or upper_limit):
+                if lower_limit <= actual_y <= upper_limit:
                     record.within_tolerance = True
                     record.tolerance_status = 'Pass'
                 else:
                     record.within_tolerance = False
-                    if record.actual_y < record.lower_limit:
-                        record.tolerance_status = f'Below limit ({record.actual_y:.2f} < {record.lower_limit:.2f})'
+                    if actual_y < lower_limit:
+                        record.tolerance_status = f'Below limit ({actual_y:.2f} < {lower_limit:.2f})'
                     else:
-                        record.tolerance_status = f'Above limit ({record.actual_y:.2f} > {record.upper_limit:.2f})'
+                        record.tolerance_status = f'Above limit ({actual_y:.2f} > {upper_limit:.2f})'
             else:
                 record.within_tolerance = True
                 record.tolerance_status = 'No limit testing'
@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import pytz
+
+_logger = logging.getLogger(__name__)
+
+# Plant timezone shared by every get_ist_now, resolved and validated once at import
+try:
+    IST_TZ = pytz.timezone('Asia/Kolkata')
+except pytz.UnknownTimeZoneError:
+    _logger.critical("Timezone Asia/Kolkata is unavailable, IST timestamps will be in UTC")
+    IST_TZ = pytz.UTC
+UTC_TZ = pytz.UTC
@@ -1,10 +1,61 @@
 # -*- coding: utf-8 -*-
 
-from odoo import models, fields, api
+from odoo import models, fields, api, tools
 from odoo.modules.module import get_module_resource
 from datetime import datetime
 import csv
-import pytz
+import itertools
+import numpy as np
+from .timezones import IST_TZ, UTC_TZ
+
+# VICI checks in evaluation order: (CSV column and label, measurement field)
+_VICI_CHECKS = (
+    ('L 64.8', 'l_64_8'),
+    ('L 35.4', 'l_35_4'),
+    ('L 46.6', 'l_46_6'),
+    ('L 82', 'l_82'),
+    ('L 128.6', 'l_128_6'),
+    ('L 164', 'l_164'),
+    ('Runout E31-E22', 'runout_e31_e22'),
+    ('Runout E21-E12', 'runout_e21_e12'),
+    ('Runout E11 tube end', 'runout_e11_tube_end'),
+    ('Angular difference E32-E12 pos tool', 'ang_diff_e32_e12_pos_tool'),
+    ('Angular difference E31-E12 pos tool', 'ang_diff_e31_e12_pos_tool'),
+    ('Angular difference E22-E12 pos tool', 'ang_diff_e22_e12_pos_tool'),
+    ('Angular difference E21-E12 pos tool', 'ang_diff_e21_e12_pos_tool'),
+    ('Angular difference E11-E12 pos tool', 'ang_diff_e11_e12_pos_tool'),
+)
+# Per check: label, value field, nominal field, lower and upper tolerance fields
+_VICI_CHECK_FIELDS = tuple(
+    (label, field_name, f'{field_name}_nominal', f'{field_name}_tol_low', f'{field_name}_tol_high')
+    for label, field_name in _VICI_CHECKS
+)
+
+_VICI_DATE_FORMATS = ("%d-%m-%Y %H:%M:%S", "%d/%m/%Y %H:%M:%S")
+_VICI_IMPORT_BATCH = 1000  # CSV data rows parsed and created per batch
+_VICI_READ_BUFFER = 1024 * 1024
+
+
+def _parse_vici_datetime(date_str, time_str):
+    """Parse a VICI 'DD-MM-YYYY' or 'DD/MM/YYYY' date and 'HH:MM:SS' time; None when invalid.
+
+    The fixed layout is split and converted directly, which is much cheaper than strptime
+    walking its format string on every row; anything unusual still goes through strptime.
+    """
+    try:
+        day, month, year = date_str.replace('/', '-').split('-')
+        hour, minute, second = time_str.split(':')
+        if len(year) == 4:
+            return datetime(int(year), int(month), int(day), int(hour), int(minute), int(second))
+    except ValueError:
+        pass
+    dt_str = f"{date_str} {time_str}"
+    for fmt in _VICI_DATE_FORMATS:
+        try:
+            return datetime.strptime(dt_str, fmt)
+        except ValueError:
+            pass
+    return None
 
 
 class ViciVision(models.Model):
@@ -16,16 +67,8 @@ class ViciVision(models.Model):
     @api.model
     def get_ist_now(self):
         """Get current IST datetime for consistent timezone handling"""
-        try:
-            ist = pytz.timezone('Asia/Kolkata')
-            utc_now = fields.Datetime.now()
-            # Convert UTC to IST
-            ist_now = pytz.UTC.localize(utc_now).astimezone(ist)
-            # Return as naive datetime in IST (Odoo will handle display)
-            return ist_now.replace(tzinfo=None)
-        except Exception as e:
-            _logger.warning(f"Error getting IST time: {e}, falling back to UTC")
-            return fields.Datetime.now()
+        # Convert UTC to IST and return it naive (Odoo will handle display)
+        return UTC_TZ.localize(fields.Datetime.now()).astimezone(IST_TZ).replace(tzinfo=None)
 
     serial_number = fields.Char('Serial Number', required=True, index=True)
     machine_id = fields.Many2one('manufacturing.machine.config', 'Machine', required=True)
@@ -119,88 +162,66 @@ class ViciVision(models.Model):
 
     rejection_reason = fields.Text('Rejection Reason')
     failed_fields = fields.Char('Failed Fields')
-    raw_data = fields.Text('Raw Data')
+    raw_data = fields.Text('Raw Data', prefetch=False)  # Loaded only when read, not with every record
 
     # Computed fields
-    within_tolerance = fields.Boolean('Within Tolerance', compute='_compute_within_tolerance')
-
-    @api.depends(
-        'l_64_8', 'l_64_8_nominal', 'l_64_8_tol_low', 'l_64_8_tol_high',
-        'l_35_4', 'l_35_4_nominal', 'l_35_4_tol_low', 'l_35_4_tol_high',
-        'l_46_6', 'l_46_6_nominal', 'l_46_6_tol_low', 'l_46_6_tol_high',
-        'l_82', 'l_82_nominal', 'l_82_tol_low', 'l_82_tol_high',
-        'l_128_6', 'l_128_6_nominal', 'l_128_6_tol_low', 'l_128_6_tol_high',
-        'l_164', 'l_164_nominal', 'l_164_tol_low', 'l_164_tol_high',
-        'runout_e31_e22', 'runout_e31_e22_nominal', 'runout_e31_e22_tol_low', 'runout_e31_e22_tol_high',
-        'runout_e21_e12', 'runout_e21_e12_nominal', 'runout_e21_e12_tol_low', 'runout_e21_e12_tol_high',
-        'runout_e11_tube_end', 'runout_e11_tube_end_nominal', 'runout_e11_tube_end_tol_low', 'runout_e11_tube_end_tol_high',
-        'ang_diff_e32_e12_pos_tool', 'ang_diff_e32_e12_pos_tool_nominal', 'ang_diff_e32_e12_pos_tool_tol_low', 'ang_diff_e32_e12_pos_tool_tol_high',
-        'ang_diff_e31_e12_pos_tool', 'ang_diff_e31_e12_pos_tool_nominal', 'ang_diff_e31_e12_pos_tool_tol_low', 'ang_diff_e31_e12_pos_tool_tol_high',
-        'ang_diff_e22_e12_pos_tool', 'ang_diff_e22_e12_pos_tool_nominal', 'ang_diff_e22_e12_pos_tool_tol_low', 'ang_diff_e22_e12_pos_tool_tol_high',
-        'ang_diff_e21_e12_pos_tool', 'ang_diff_e21_e12_pos_tool_nominal', 'ang_diff_e21_e12_pos_tool_tol_low', 'ang_diff_e21_e12_pos_tool_tol_high',
-        'ang_diff_e11_e12_pos_tool', 'ang_diff_e11_e12_pos_tool_nominal', 'ang_diff_e11_e12_pos_tool_tol_low', 'ang_diff_e11_e12_pos_tool_tol_high'
-    )
+    within_tolerance = fields.Boolean('Within Tolerance', compute='_compute_within_tolerance', store=True)
+
+    def init(self):
+        """Composite index backing the per-machine dashboard aggregates on test_date/result"""
+        tools.create_index(self.env.cr, 'manufacturing_vici_vision_machine_date_result_idx',
+                           self._table, ['machine_id', 'test_date', 'result'])
+
+    @api.depends(*(name for _label, *names in _VICI_CHECK_FIELDS for name in names))
     def _compute_within_tolerance(self):
         for record in self:
-            checks = []
-            def in_window(value, nominal, tol_low, tol_high):
+            within = True
+            for _label, field_name, nominal_key, low_key, high_key in _VICI_CHECK_FIELDS:
+                value, nominal = record[field_name], record[nominal_key]
+                tol_low, tol_high = record[low_key], record[high_key]
                 if value is None or nominal is None or tol_low is None or tol_high is None:
-                    return True
-                return (nominal + tol_low) <= value <= (nominal + tol_high)
-
-            checks.append(in_window(record.l_64_8, record.l_64_8_nominal, record.l_64_8_tol_low, record.l_64_8_tol_high))
-            checks.append(in_window(record.l_35_4, record.l_35_4_nominal, record.l_35_4_tol_low, record.l_35_4_tol_high))
-            checks.append(in_window(record.l_46_6, record.l_46_6_nominal, record.l_46_6_tol_low, record.l_46_6_tol_high))
-            checks.append(in_window(record.l_82, record.l_82_nominal, record.l_82_tol_low, record.l_82_tol_high))
-            checks.append(in_window(record.l_128_6, record.l_128_6_nominal, record.l_128_6_tol_low, record.l_128_6_tol_high))
-            checks.append(in_window(record.l_164, record.l_164_nominal, record.l_164_tol_low, record.l_164_tol_high))
-            checks.append(in_window(record.runout_e31_e22, record.runout_e31_e22_nominal, record.runout_e31_e22_tol_low, record.runout_e31_e22_tol_high))
-            checks.append(in_window(record.runout_e21_e12, record.runout_e21_e12_nominal, record.runout_e21_e12_tol_low, record.runout_e21_e12_tol_high))
-            checks.append(in_window(record.runout_e11_tube_end, record.runout_e11_tube_end_nominal, record.runout_e11_tube_end_tol_low, record.runout_e11_tube_end_tol_high))
-            checks.append(in_window(record.ang_diff_e32_e12_pos_tool, record.ang_diff_e32_e12_pos_tool_nominal, record.ang_diff_e32_e12_pos_tool_tol_low, record.ang_diff_e32_e12_pos_tool_tol_high))
-            checks.append(in_window(record.ang_diff_e31_e12_pos_tool, record.ang_diff_e31_e12_pos_tool_nominal, record.ang_diff_e31_e12_pos_tool_tol_low, record.ang_diff_e31_e12_pos_tool_tol_high))
-            checks.append(in_window(record.ang_diff_e22_e12_pos_tool, record.ang_diff_e22_e12_pos_tool_nominal, record.ang_diff_e22_e12_pos_tool_tol_low, record.ang_diff_e22_e12_pos_tool_tol_high))
-            checks.append(in_window(record.ang_diff_e21_e12_pos_tool, record.ang_diff_e21_e12_pos_tool_nominal, record.ang_diff_e21_e12_pos_tool_tol_low, record.ang_diff_e21_e12_pos_tool_tol_high))
-            checks.append(in_window(record.ang_diff_e11_e12_pos_tool, record.ang_diff_e11_e12_pos_tool_nominal, record.ang_diff_e11_e12_pos_tool_tol_low, record.ang_diff_e11_e12_pos_tool_tol_high))
-            record.within_tolerance = all(checks) if checks else False
+                    continue
+                if not (nominal + tol_low) <= value <= (nominal + tol_high):
+                    within = False
+                    break
+            record.within_tolerance = within
 
     @api.model_create_multi
     def create(self, vals_list):
         records = super().create(vals_list)
-        for record in records:
-            # Update or create part quality record
-            self._update_part_quality(record)
+        # Update or create part quality records
+        records._update_part_quality_batch()
         return records
 
     def _update_part_quality(self, record):
-        """Update the corresponding part quality record"""
-        part_quality = self.env['manufacturing.part.quality'].search([
-            ('serial_number', '=', record.serial_number)
-        ], limit=1)
-
-        if not part_quality:
-            part_quality = self.env['manufacturing.part.quality'].create({
+        """Update the part quality record of a single VICI record (used by the station override wizard)"""
+        record._update_part_quality_batch()
+
+    def _update_part_quality_batch(self):
+        """Update the corresponding part quality records for all VICI records in one pass"""
+        records = self.filtered('serial_number')
+        if not records:
+            return
+        serials = set(records.mapped('serial_number'))
+
+        # Latest test_date among all VICI records with the same serial_number
+        latest_dates = dict(self._read_group(
+            [('serial_number', 'in', list(serials))], ['serial_number'], ['test_date:max'],
+        ))
+
+        # The last VICI record of a part in this batch sets its result; a new part is dated by its
+        # first record when no VICI record of it has a date yet
+        vals_by_serial = {}
+        for record in records:
+            vals = vals_by_serial.setdefault(record.serial_number, {
                 'serial_number': record.serial_number,
-                'test_date': record.test_date,
+                'test_date': latest_dates.get(record.serial_number) or record.test_date,
             })
+            vals['vici_result'] = record.result
 
-        # Find the latest test_date among all VICI records with the same serial_number
-        latest_vici = self.env['manufacturing.vici.vision'].search([
-            ('serial_number', '=', record.serial_number)
-        ], order='test_date desc', limit=1)
-        
-        # Update test_date with the latest one if found
-        update_vals = {}
-        if latest_vici and latest_vici.test_date:
-            if not part_quality.test_date or latest_vici.test_date > part_quality.test_date:
-                update_vals['test_date'] = latest_vici.test_date
-
-        # Update vici_result - use write with skip flag to prevent recursion
-        if part_quality.vici_result != record.result:
-            update_vals['vici_result'] = record.result
-        
-        if update_vals:
-            part_quality.with_context(skip_station_recalculate=True).write(update_vals)
+        # Update vici_result - use the skip flag to prevent recursion
+        self.env['manufacturing.part.quality'].with_context(skip_station_recalculate=True)._bulk_upsert(
+            list(vals_by_serial.values()), later_only=('test_date',))
 
     def action_override_result(self):
         """Open wizard to override VICI result - updates station record first, then syncs to part_quality"""
@@ -228,35 +249,58 @@ class ViciVision(models.Model):
 
     def _compute_result_and_reason(self, vals):
         failed = []
-        def check(name, v, n, lo, hi):
+        for label, field_name, nominal_key, low_key, high_key in _VICI_CHECK_FIELDS:
+            v, n = vals.get(field_name), vals.get(nominal_key)
+            lo, hi = vals.get(low_key), vals.get(high_key)
             if v is None or n is None or lo is None or hi is None:
-                return
+                continue
             if not ((n + lo) <= v <= (n + hi)):
-                failed.append(name)
-
-        check('L 64.8', vals.get('l_64_8'), vals.get('l_64_8_nominal'), vals.get('l_64_8_tol_low'), vals.get('l_64_8_tol_high'))
-        check('L 35.4', vals.get('l_35_4'), vals.get('l_35_4_nominal'), vals.get('l_35_4_tol_low'), vals.get('l_35_4_tol_high'))
-        check('L 46.6', vals.get('l_46_6'), vals.get('l_46_6_nominal'), vals.get('l_46_6_tol_low'), vals.get('l_46_6_tol_high'))
-        check('L 82', vals.get('l_82'), vals.get('l_82_nominal'), vals.get('l_82_tol_low'), vals.get('l_82_tol_high'))
-        check('L 128.6', vals.get('l_128_6'), vals.get('l_128_6_nominal'), vals.get('l_128_6_tol_low'), vals.get('l_128_6_tol_high'))
-        check('L 164', vals.get('l_164'), vals.get('l_164_nominal'), vals.get('l_164_tol_low'), vals.get('l_164_tol_high'))
-        check('Runout E31-E22', vals.get('runout_e31_e22'), vals.get('runout_e31_e22_nominal'), vals.get('runout_e31_e22_tol_low'), vals.get('runout_e31_e22_tol_high'))
-        check('Runout E21-E12', vals.get('runout_e21_e12'), vals.get('runout_e21_e12_nominal'), vals.get('runout_e21_e12_tol_low'), vals.get('runout_e21_e12_tol_high'))
-        check('Runout E11 tube end', vals.get('runout_e11_tube_end'), vals.get('runout_e11_tube_end_nominal'), vals.get('runout_e11_tube_end_tol_low'), vals.get('runout_e11_tube_end_tol_high'))
-        check('Angular difference E32-E12 pos tool', vals.get('ang_diff_e32_e12_pos_tool'), vals.get('ang_diff_e32_e12_pos_tool_nominal'), vals.get('ang_diff_e32_e12_pos_tool_tol_low'), vals.get('ang_diff_e32_e12_pos_tool_tol_high'))
-        check('Angular difference E31-E12 pos tool', vals.get('ang_diff_e31_e12_pos_tool'), vals.get('ang_diff_e31_e12_pos_tool_nominal'), vals.get('ang_diff_e31_e12_pos_tool_tol_low'), vals.get('ang_diff_e31_e12_pos_tool_tol_high'))
-        check('Angular difference E22-E12 pos tool', vals.get('ang_diff_e22_e12_pos_tool'), vals.get('ang_diff_e22_e12_pos_tool_nominal'), vals.get('ang_diff_e22_e12_pos_tool_tol_low'), vals.get('ang_diff_e22_e12_pos_tool_tol_high'))
-        check('Angular difference E21-E12 pos tool', vals.get('ang_diff_e21_e12_pos_tool'), vals.get('ang_diff_e21_e12_pos_tool_nominal'), vals.get('ang_diff_e21_e12_pos_tool_tol_low'), vals.get('ang_diff_e21_e12_pos_tool_tol_high'))
-        check('Angular difference E11-E12 pos tool', vals.get('ang_diff_e11_e12_pos_tool'), vals.get('ang_diff_e11_e12_pos_tool_nominal'), vals.get('ang_diff_e11_e12_pos_tool_tol_low'), vals.get('ang_diff_e11_e12_pos_tool_tol_high'))
+                failed.append(label)
 
         result = 'pass' if not failed else 'reject'
         reason = False if not failed else 'Out of tolerance: ' + ', '.join(failed)
         return result, reason, failed
 
+    @api.model
+    def _evaluate_tolerance_matrix(self, labels, values, nominal, tol_low, tol_high):
+        """Check all rows of a measurement matrix against per-column tolerance windows at once.
+        :param labels: column labels used in the rejection reason, in check order
+        :param values: one list of measurements per row (None when missing)
+        :param nominal, tol_low, tol_high: one value per column (None when missing)
+        :return: one (result, reason, failed) tuple per row, as _compute_result_and_reason returns
+        A missing value or tolerance skips that check, like in _compute_result_and_reason.
+        """
+        if not values:
+            return []
+        # None becomes NaN; every comparison with NaN is False, so skipped checks are OR-ed back in
+        values = np.array(values, dtype=np.float64).reshape(-1, len(labels))
+        nominal = np.array(nominal, dtype=np.float64)
+        low = nominal + np.array(tol_low, dtype=np.float64)
+        high = nominal + np.array(tol_high, dtype=np.float64)
+        ok = (values >= low) & (values <= high)
+        ok |= np.isnan(values) | np.isnan(low) | np.isnan(high)
+
+        results = [('pass', False, [])] * len(values)
+        for row_idx in np.flatnonzero(~ok.all(axis=1)):
+            failed = [labels[col] for col in np.flatnonzero(~ok[row_idx])]
+            results[row_idx] = ('reject', 'Out of tolerance: ' + ', '.join(failed), failed)
+        return results
+
+    def _create_import_batch(self, vals_list, measurements, check_labels, check_nominal, check_tol_low, check_tol_high):
+        """Set result fields on a batch of parsed CSV rows from the file's tolerance windows and create them"""
+        evaluations = self._evaluate_tolerance_matrix(
+            check_labels, measurements, check_nominal, check_tol_low, check_tol_high)
+        for vals, (result, reason, failed) in zip(vals_list, evaluations):
+            vals['result'] = result
+            vals['rejection_reason'] = reason
+            vals['failed_fields'] = False if result == 'pass' else ', '.join(failed)
+        return self.create(vals_list)
+
     def import_vici_csv(self, machine_id, filename='vici_vision_data.csv'):
         """Import VICI Vision CSV located in this module's data/csv_data folder.
         :param machine_id: manufacturing.machine.config id
         :param filename: CSV filename inside module folder
+        Set the ``vici_store_raw`` context key to also keep each source line in raw_data.
         """
         self.ensure_one()
         # Resolve CSV file within this addon
@@ -264,36 +308,21 @@ class ViciVision(models.Model):
         if not path:
             return False
 
+        created = 0
         records_to_create = []
-        with open(path, newline='', encoding='utf-8-sig') as csvfile:
+        measurements = []  # Checked values per row, evaluated together per batch
+        # 1 MiB read buffer: a multi-MB export is read in a handful of syscalls instead of 8 KiB chunks
+        with open(path, newline='', encoding='utf-8-sig', buffering=_VICI_READ_BUFFER) as csvfile:
+            # Stream the file: only the six metadata rows and the current batch are held in memory
             reader = csv.reader(csvfile)
-            rows = list(reader)
-            if len(rows) < 7:
-                return False
-
-            header = rows[0]
             # rows[1] drawing ids, rows[2] description, rows[3] nominal, rows[4] lower tol, rows[5] upper tol
-            nominal_row = rows[3]
-            lower_row = rows[4]
-            upper_row = rows[5]
+            header, _drawing_row, _description_row, nominal_row, lower_row, upper_row, first_data_row = (
+                next(reader, None) for _i in range(7))
+            if first_data_row is None:
+                return False
 
             # Map CSV columns to our field names
-            field_map = {
-                'L 64.8': 'l_64_8',
-                'L 35.4': 'l_35_4',
-                'L 46.6': 'l_46_6',
-                'L 82': 'l_82',
-                'L 128.6': 'l_128_6',
-                'L 164': 'l_164',
-                'Runout E31-E22': 'runout_e31_e22',
-                'Runout E21-E12': 'runout_e21_e12',
-                'Runout E11 tube end': 'runout_e11_tube_end',
-                'Angular difference E32-E12 pos tool': 'ang_diff_e32_e12_pos_tool',
-                'Angular difference E31-E12 pos tool': 'ang_diff_e31_e12_pos_tool',
-                'Angular difference E22-E12 pos tool': 'ang_diff_e22_e12_pos_tool',
-                'Angular difference E21-E12 pos tool': 'ang_diff_e21_e12_pos_tool',
-                'Angular difference E11-E12 pos tool': 'ang_diff_e11_e12_pos_tool',
-            }
+            field_map = dict(_VICI_CHECKS)
 
             # Build tolerance dictionaries per column index
             col_to_nominal = {}
@@ -305,8 +334,38 @@ class ViciVision(models.Model):
                     col_to_tol_low[idx] = self._parse_float(lower_row[idx])
                     col_to_tol_high[idx] = self._parse_float(upper_row[idx])
 
+            # Tolerance windows in check order; a column missing from the header is never checked
+            check_labels = list(field_map)
+            check_fields = list(field_map.values())
+            col_by_field = {field_map[name]: idx for idx, name in enumerate(header) if name in field_map}
+            check_nominal = [col_to_nominal.get(col_by_field.get(f)) for f in check_fields]
+            check_tol_low = [col_to_tol_low.get(col_by_field.get(f)) for f in check_fields]
+            check_tol_high = [col_to_tol_high.get(col_by_field.get(f)) for f in check_fields]
+
+            # Column index, target field names and file-wide tolerances, resolved once instead of per row
+            col_specs = [
+                (idx, field_name, f'{field_name}_nominal', f'{field_name}_tol_low', f'{field_name}_tol_high',
+                 col_to_nominal[idx], col_to_tol_low[idx], col_to_tol_high[idx])
+                for idx, name in enumerate(header)
+                if (field_name := field_map.get(name))
+            ]
+
+            # Every parsed column already has its own field; keep the source line only on request
+            store_raw = self.env.context.get('vici_store_raw')
+
+            # File-wide values filled once and copied per row; rows covering every measured column
+            # also take the tolerances from the template, shorter rows only for the columns they have
+            base_vals = {'machine_id': machine_id}
+            full_vals = dict(base_vals)
+            for idx, field_name, nominal_key, low_key, high_key, nominal, tol_low, tol_high in col_specs:
+                full_vals[nominal_key] = nominal
+                full_vals[low_key] = tol_low
+                full_vals[high_key] = tol_high
+            full_row_len = max((spec[0] for spec in col_specs), default=-1) + 1
+            parse_float = self._parse_float
+
             # Data rows start at index 6
-            for row in rows[6:]:
+            for row in itertools.chain([first_data_row], reader):
                 if not row or len(row) < 7:
                     continue
                 date_str = row[0].strip() if len(row) > 0 else ''
@@ -323,47 +382,47 @@ class ViciVision(models.Model):
                 # Combine date and time (accept DD-MM-YYYY or DD/MM/YYYY); skip if invalid
                 if not date_str or not time_str:
                     continue
-                parsed_dt = None
-                for fmt in ("%d-%m-%Y %H:%M:%S", "%d/%m/%Y %H:%M:%S"):
-                    try:
-                        parsed_dt = datetime.strptime(f"{date_str} {time_str}", fmt)
-                        break
-                    except Exception:
-                        parsed_dt = None
+                parsed_dt = _parse_vici_datetime(date_str, time_str)
                 if not parsed_dt:
                     continue
 
-                vals = {
-                    'serial_number': serial,
-                    'machine_id': machine_id,
-                    'test_date': parsed_dt,
-                    'operator_name': operator,
-                    'log_date': parsed_dt.date(),
-                    'log_time': time_str or parsed_dt.strftime("%H:%M:%S"),
-                    'batch_serial_number': batch_sn,
-                    'measure_number': measure_number,
-                    'measure_state': measure_state,
-                    'raw_data': ','.join(row),
-                }
-
-                # Populate measurement values and tolerances
-                for idx, name in enumerate(header):
-                    if name in field_map and idx < len(row):
-                        field_name = field_map[name]
-                        vals[field_name] = self._parse_float(row[idx])
+                row_len = len(row)
+                is_full_row = row_len >= full_row_len
+                vals = (full_vals if is_full_row else base_vals).copy()
+                vals['serial_number'] = serial
+                vals['test_date'] = parsed_dt
+                vals['operator_name'] = operator
+                vals['log_date'] = parsed_dt.date()
+                vals['log_time'] = time_str or parsed_dt.strftime("%H:%M:%S")
+                vals['batch_serial_number'] = batch_sn
+                vals['measure_number'] = measure_number
+                vals['measure_state'] = measure_state
+                if store_raw:
+                    vals['raw_data'] = ','.join(row)
+
+                # Populate measurement values (and, for short rows, the tolerances of the columns present)
+                for idx, field_name, nominal_key, low_key, high_key, nominal, tol_low, tol_high in col_specs:
+                    if is_full_row:
+                        vals[field_name] = parse_float(row[idx])
+                    elif idx < row_len:
+                        vals[field_name] = parse_float(row[idx])
                         # Tolerance & nominal to dedicated fields
-                        vals[f'{field_name}_nominal'] = col_to_nominal.get(idx)
-                        vals[f'{field_name}_tol_low'] = col_to_tol_low.get(idx)
-                        vals[f'{field_name}_tol_high'] = col_to_tol_high.get(idx)
-
-                result, reason, failed = self._compute_result_and_reason(vals)
-                vals['result'] = result
-                vals['rejection_reason'] = reason
-                vals['failed_fields'] = False if result == 'pass' else ', '.join(failed)
+                        vals[nominal_key] = nominal
+                        vals[low_key] = tol_low
+                        vals[high_key] = tol_high
 
                 records_to_create.append(vals)
-
-        if records_to_create:
-            self.create(records_to_create)
-            return len(records_to_create)
-        return 0
\ No newline at end of file
+                measurements.append([vals.get(f) for f in check_fields])
+
+                if len(records_to_create) >= _VICI_IMPORT_BATCH:
+                    self._create_import_batch(records_to_create, measurements,
+                                              check_labels, check_nominal, check_tol_low, check_tol_high)
+                    created += len(records_to_create)
+                    records_to_create = []
+                    measurements = []
+
+            if records_to_create:
+                self._create_import_batch(records_to_create, measurements,
+                                          check_labels, check_nominal, check_tol_low, check_tol_high)
+                created += len(records_to_create)
+        return created
\ No newline at end of file
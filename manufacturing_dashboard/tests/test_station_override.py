@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+from odoo import fields
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestStationOverride(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.vici_machine = cls.env['manufacturing.machine.config'].create({
+            'machine_name': 'Test VICI',
+            'machine_type': 'vici_vision',
+        })
+
+    def _override(self, station_record, station_name, new_result):
+        wizard = self.env['manufacturing.station.override.wizard'].with_context(
+            default_station_model=station_record._name,
+            default_station_record_id=station_record.id,
+            default_station_name=station_name,
+        ).create({
+            'new_result': new_result,
+            'comments': 'Re-measured by QE',
+        })
+        wizard.action_override()
+
+    def test_vici_override_syncs_station_result(self):
+        """A VICI override updates the part's station result without freezing its final result"""
+        vici = self.env['manufacturing.vici.vision'].create({
+            'serial_number': 'TEST-VICI-OVERRIDE',
+            'machine_id': self.vici_machine.id,
+            'test_date': fields.Datetime.now(),
+            'result': 'reject',
+        })
+        part = self.env['manufacturing.part.quality'].search([('serial_number', '=', 'TEST-VICI-OVERRIDE')])
+        self.assertEqual(len(part), 1)
+        self.assertEqual(part.vici_result, 'reject')
+        self.assertEqual(part.final_result, 'reject')
+
+        self._override(vici, 'vici', 'pass')
+
+        self.assertEqual(vici.result, 'pass')
+        self.assertEqual(part.vici_result, 'pass')
+        self.assertFalse(part.qe_override)
+        # Other stations are still pending, so the part follows them rather than staying frozen
+        self.assertEqual(part.final_result, 'pending')
+
+    def test_ruhlamat_override_syncs_station_result(self):
+        """A Ruhlamat override goes through the station sync, not the QE override fallback"""
+        machine = self.env['manufacturing.machine.config'].create({
+            'machine_name': 'Test Ruhlamat',
+            'machine_type': 'ruhlamat',
+        })
+        cycle = self.env['manufacturing.ruhlamat.press'].create({
+            'cycle_id': 987654,
+            'cycle_date': fields.Datetime.now(),
+            'part_id1': 'TEST-RUHLAMAT-OVERRIDE',
+            'ok_status': -1,
+            'machine_id': machine.id,
+        })
+        part = cycle.part_quality_id
+        self.assertEqual(part.ruhlamat_result, 'reject')
+
+        self._override(cycle, 'ruhlamat', 'pass')
+
+        self.assertEqual(part.ruhlamat_result, 'pass')
+        self.assertFalse(part.qe_override)
+        self.assertEqual(part.final_result, 'pending')
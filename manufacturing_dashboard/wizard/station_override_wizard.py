@@ -72,8 +72,14 @@ class StationOverrideWizard(models.TransientModel):
         # Set current result from station record and default new_result to 'pass'
         if defaults.get('station_model') and defaults.get('station_record_id'):
             try:
-                station_record = self.env[defaults['station_model']].browse(defaults['station_record_id'])
-                if station_record.exists() and hasattr(station_record, 'result'):
+                # Share one prefetch set with the other selected station records, so reading
+                # their results while overriding them one after another costs a single query
+                record_id = defaults['station_record_id']
+                prefetch_ids = [record_id]
+                if self.env.context.get('active_model') == defaults['station_model']:
+                    prefetch_ids = self.env.context.get('active_ids') or prefetch_ids
+                station_record = self.env[defaults['station_model']].browse(record_id).with_prefetch(tuple(prefetch_ids))
+                if station_record.exists():
                     # Map station result to part_quality format
                     station_result = station_record.result
                     if station_result in ('pass', 'reject'):